@@ -0,0 +1,106 @@
+"""Tests of GraphWin.animate, run on an OffscreenWin whose timers and clock the tests drive"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, GraphicsError, Point, Rectangle
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class AnimationTest(unittest.TestCase):
+
+	def setUp(self):
+		self.now = 0.0
+		self.clock, graphics._clock = graphics._clock, lambda: self.now
+		self.win = OffscreenWin(100, 100)
+		self.timers = {}
+		self.flushes = 0
+		self.win.after = self.after
+		self.win.after_cancel = self.timers.pop
+		self.win._wakeMouse = lambda: None
+		self.win._update = self.update
+
+	def tearDown(self):
+		graphics._clock = self.clock
+
+	def after(self, ms, function):
+		timer = "after#%d" % len(self.timers)
+		self.timers[timer] = (self.now + ms / 1000.0, function)
+		return timer
+
+	def update(self):
+		self.flushes += 1
+
+	def runTimers(self, limit = 100):
+		# runs the timers in order, advancing the clock to each
+		while self.timers and limit:
+			timer = min(self.timers, key = lambda key: self.timers[key][0])
+			due, function = self.timers.pop(timer)
+			self.now = max(self.now, due)
+			function()
+			limit -= 1
+
+	def test_frames(self):
+		shape = Rectangle(Point(0, 0), Point(10, 10))
+		shape.draw(self.win)
+		times = []
+		def step(dt):
+			times.append(dt)
+			shape.move(10, 0)
+		animation = self.win.animate(step, fps = 50, frames = 4)
+		self.assertTrue(animation.isRunning())
+		self.runTimers()
+		self.assertFalse(animation.isRunning())
+		self.assertEqual(animation.count, 4)
+		self.assertEqual([round(dt, 2) for dt in times], [0, 0.02, 0.02, 0.02])
+		self.assertEqual(self.win.coords(shape.id), [40, 0, 50, 10])
+		self.assertAlmostEqual(animation.getFPS(), 50, delta = 1)
+		self.assertEqual(self.timers, {})
+
+	def test_one_flush_per_frame(self):
+		shapes = [Rectangle(Point(i, i), Point(i + 5, i + 5)) for i in range(10)]
+		for shape in shapes:
+			shape.draw(self.win)
+		self.win.autoflush = True
+		self.flushes = 0
+		def step(dt):
+			for shape in shapes:
+				shape.move(1, 0)
+		self.win.animate(step, frames = 3)
+		self.runTimers()
+		self.assertEqual(self.flushes, 3)
+
+	def test_stopping(self):
+		animation = self.win.animate(lambda dt: animation.count < 2)
+		self.runTimers()
+		self.assertEqual(animation.count, 3)
+		animation = self.win.animate(lambda dt: None)
+		self.runTimers(limit = 5)
+		animation.stop()
+		self.assertFalse(animation.isRunning())
+		self.assertEqual(self.timers, {})
+		animation = self.win.animate(lambda dt: None)
+		self.win.close()
+		self.runTimers()
+		self.assertFalse(animation.isRunning())
+
+	def test_dropped_frames(self):
+		def step(dt):
+			self.now += 0.06 # overruns the next two frames
+		animation = self.win.animate(step, fps = 40, frames = 3)
+		self.runTimers()
+		self.assertEqual(animation.dropped, 4)
+		self.assertEqual(len(animation.times), 3)
+		self.assertEqual(round(animation.percentile(50), 6), 0.06)
+
+	def test_errors(self):
+		self.assertRaises(GraphicsError, self.win.animate, lambda dt: None, fps = 0)
+		def step(dt):
+			raise ValueError("step failed")
+		animation = self.win.animate(step)
+		self.assertRaises(ValueError, self.runTimers)
+		self.assertFalse(animation.isRunning())
+
+if __name__ == "__main__":
+	unittest.main()
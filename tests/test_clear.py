@@ -0,0 +1,76 @@
+"""Tests of GraphWin.clear, which deletes everything in one canvas command"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, GraphicsGroup, Point, Rectangle, Circle
+
+WHITE = (255, 255, 255, 255)
+
+def rectangle(x1, y1, x2, y2, color = "red"):
+	shape = Rectangle(Point(x1, y1), Point(x2, y2))
+	shape.setFill(color)
+	return shape
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class ClearTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+
+	def test_clear(self):
+		shapes = [rectangle(i, i, i + 5, i + 5) for i in range(0, 50, 10)]
+		for shape in shapes:
+			shape.draw(self.win)
+		self.win.clear()
+		self.assertEqual(list(self.win.find_all()), [])
+		self.assertEqual(self.win.all_objects, {})
+		self.assertTrue(all(shape.canvas is None and shape.id is None for shape in shapes))
+		self.assertEqual(self.win.image.getpixel((2, 2)), WHITE)
+		# cleared objects may be drawn again
+		shapes[0].draw(self.win)
+		self.assertEqual(list(self.win.find_all()), [shapes[0].id])
+
+	def test_other_windows(self):
+		other = OffscreenWin(100, 100)
+		mine, theirs = rectangle(10, 10, 20, 20), Circle(Point(50, 50), 10)
+		mine.draw(self.win)
+		theirs.draw(other)
+		self.win.clear(theirs)
+		self.assertIsNone(theirs.canvas)
+		self.assertEqual(list(other.find_all()), [])
+
+	def test_index_and_pixels(self):
+		shape = rectangle(10, 10, 20, 20)
+		shape.draw(self.win)
+		self.assertEqual(self.win.objectsAt(Point(15, 15)), [shape])
+		self.win.plotPixels([1, 2], [1, 2], "blue")
+		self.win.clear()
+		self.assertEqual(self.win.objectsAt(Point(15, 15)), [])
+		self.assertEqual(self.win.image.getpixel((1, 1)), WHITE)
+
+	def test_groups(self):
+		shapes = [rectangle(10, 10, 20, 20), rectangle(30, 30, 40, 40)]
+		group = GraphicsGroup(shapes)
+		group.draw(self.win)
+		self.win.clear()
+		self.assertTrue(all(shape.canvas is None for shape in shapes))
+		group.draw(self.win)
+		self.assertEqual(len(self.win.find_withtag(group.tag)), 2)
+
+	def test_single_flush(self):
+		for i in range(20):
+			rectangle(i, i, i + 5, i + 5).draw(self.win)
+		flushes = []
+		self.win._update = lambda: flushes.append(1)
+		self.win.clear()
+		self.assertEqual(len(flushes), 1)
+		with self.win.batch():
+			rectangle(10, 10, 20, 20).draw(self.win)
+			self.win.clear()
+		self.assertEqual(len(flushes), 2)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,95 @@
+"""Tests of viewport culling: drawn objects outside the window's coordinates have no canvas item"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, GraphicsGroup, Point, Rectangle, Text
+
+RED, BLUE = (255, 0, 0, 255), (0, 0, 255, 255)
+
+def rectangle(x1, y1, x2, y2, color = "red"):
+	shape = Rectangle(Point(x1, y1), Point(x2, y2))
+	shape.setFill(color)
+	shape.setOutline(color)
+	return shape
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class CullingTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+
+	def test_culling(self):
+		self.win.setCulling(True)
+		self.assertTrue(self.win.isCulling())
+		shape = rectangle(150, 150, 160, 160)
+		shape.draw(self.win)
+		self.assertIsNone(shape.id)
+		self.assertIs(shape.canvas, self.win)
+		self.assertEqual(self.win.objectsAt(Point(155, 155)), [shape])
+		shape.move(-100, -100)
+		self.assertIsNotNone(shape.id)
+		self.assertEqual(self.win.image.getpixel((55, 55)), RED)
+		shape.move(100, 100)
+		self.assertIsNone(shape.id)
+		self.assertEqual(list(self.win.find_all()), [])
+		self.win.setCulling(False)
+		self.assertIsNotNone(shape.id)
+
+	def test_existing_objects(self):
+		inside, outside = rectangle(10, 10, 20, 20), rectangle(-50, 10, -40, 20)
+		inside.draw(self.win)
+		outside.draw(self.win)
+		self.win.setCulling(True)
+		self.assertIsNotNone(inside.id)
+		self.assertIsNone(outside.id)
+		outside.setFill("blue")
+		outside.undraw()
+		self.assertIsNone(outside.canvas)
+		self.assertEqual(list(self.win.find_all()), [inside.id])
+
+	def test_set_coords(self):
+		self.win.setCulling(True)
+		near, far = rectangle(10, 10, 20, 20), rectangle(210, 210, 220, 220, "blue")
+		near.draw(self.win)
+		far.draw(self.win)
+		self.assertIsNone(far.id)
+		self.win.setCoords(200, 200, 300, 300)
+		self.assertIsNone(near.id)
+		self.assertIsNotNone(far.id)
+		self.assertEqual(self.win.image.getpixel((15, 85)), BLUE)
+		self.win.setCoords(0, 0, 300, 300)
+		# drawn again in drawing order, so the stacking order is kept
+		self.assertEqual(list(self.win.find_all()), [near.id, far.id])
+
+	def test_group_tags_kept(self):
+		self.win.setCulling(True)
+		shape = rectangle(10, 10, 20, 20)
+		group = GraphicsGroup(shape)
+		group.draw(self.win)
+		shape.move(200, 0)
+		self.assertIsNone(shape.id)
+		group.move(-200, 0)
+		self.assertIsNotNone(shape.id)
+		self.assertIn(group.tag, self.win.gettags(shape.id))
+		group.setFill("blue")
+		self.assertEqual(self.win.image.getpixel((15, 15)), BLUE)
+
+	def test_only_shapes(self):
+		self.win.setCulling(True)
+		label = Text(Point(500, 500), "far away")
+		label.draw(self.win)
+		self.assertIsNotNone(label.id)
+
+	def test_clear(self):
+		self.win.setCulling(True)
+		shape = rectangle(150, 150, 160, 160)
+		shape.draw(self.win)
+		self.win.clear()
+		self.assertIsNone(shape.canvas)
+		self.assertEqual(self.win._drawn(), [])
+
+if __name__ == "__main__":
+	unittest.main()
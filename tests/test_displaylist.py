@@ -0,0 +1,73 @@
+"""Tests of display-list recording, replay and the binary format, run on an OffscreenWin"""
+
+import os, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, DisplayList, Point, Rectangle, Polyline, Text
+
+RED = (255, 0, 0, 255)
+
+def commands(displayList):
+	return [(kind, list(coords), config) for kind, coords, config in displayList]
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class RecordingTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+		self.win.record()
+		self.shape = Rectangle(Point(10, 10), Point(30, 30))
+		self.shape.setFill("red")
+		self.shape.setOutline("red")
+		self.shape.draw(self.win)
+		Polyline([0, 0, 50, 50, 90, 10]).draw(self.win)
+		Text(Point(50, 80), "label").draw(self.win)
+		self.win.plot(5, 5, "blue")
+
+	def test_follows_the_drawing(self):
+		self.assertEqual([kind for kind, coords, config in self.win.displayList()], ["rectangle", "polyline", "text", "plot"])
+		self.shape.move(5, 0)
+		self.assertEqual(list(list(self.win.displayList())[0][1]), [15, 10, 35, 30])
+		self.shape.undraw()
+		self.assertEqual(len(self.win.displayList()), 3)
+		self.win.clear()
+		self.assertEqual(len(self.win.displayList()), 0)
+
+	def test_round_trip(self):
+		scene = self.win.displayList()
+		loaded = DisplayList.fromBytes(scene.toBytes())
+		self.assertEqual(commands(loaded), commands(scene))
+		path = os.path.join(tempfile.mkdtemp(), "scene.gwdl")
+		scene.save(path)
+		self.assertEqual(commands(DisplayList.load(path)), commands(scene))
+		other = OffscreenWin(100, 100)
+		loaded.replay(other)
+		self.assertEqual(len(other.find_all()), len(self.win.find_all()))
+		self.assertEqual(other.image.getpixel((25, 15)), RED)
+
+	def test_values(self):
+		scene = DisplayList()
+		config = {"fill": u"café", "width": 2, "smooth": False, "dash": (4, 2), "arrow": None, "scale": 0.5}
+		scene.add("line", [0, 0, 1, 1], config)
+		self.assertEqual(commands(DisplayList.fromBytes(scene.toBytes())), [("line", [0, 0, 1, 1], config)])
+		self.assertRaises(graphics.GraphicsError, DisplayList.fromBytes, b"nope")
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class GraphTest(unittest.TestCase):
+
+	def test_recorded_refresh(self):
+		from tk.graphTools import OffscreenGraph
+		graph = OffscreenGraph("x**2", xMin = -5, xMax = 5, yMin = -1, yMax = 25, record = True)
+		graph.setMainVariable("x")
+		graph.graph()
+		marker = Rectangle(Point(-4, 20), Point(-3, 21))
+		marker.draw(graph)
+		graph.refresh()
+		self.assertIs(marker.canvas, graph)
+		self.assertIn(marker, graph.objectsAt(Point(-3.5, 20.5)))
+		self.assertEqual(len(graph.all_objects), 2)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,82 @@
+"""Tests of GraphicsGroup and the bulk helpers drawAll, undrawAll and redrawAll, run on an OffscreenWin"""
+
+import os, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import (OffscreenWin, GraphicsGroup, Point, Rectangle, Circle, PointCloud, TiledImage,
+	drawAll, undrawAll, redrawAll)
+
+WHITE, RED, BLUE = (255, 255, 255, 255), (255, 0, 0, 255), (0, 0, 255, 255)
+
+def box(win, item):
+	return [round(c, 6) for c in win.coords(item.id)]
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class GroupTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+
+	def test_members_drawn_on_their_own(self):
+		first, second = Rectangle(Point(10, 10), Point(20, 20)), Circle(Point(50, 50), 5)
+		first.setOutline("red")
+		group = GraphicsGroup(first, second)
+		first.draw(self.win)
+		second.draw(self.win)
+		group.move(5, 5)
+		self.assertEqual(box(self.win, first), [15, 15, 25, 25])
+		self.assertEqual(box(self.win, second), [50, 50, 60, 60])
+		group.setFill("blue")
+		self.assertEqual(self.win.image.getpixel((20, 20)), BLUE)
+		group.undraw()
+		self.assertEqual(list(self.win.find_all()), [])
+		group.remove(second)
+		group.draw(self.win)
+		self.assertIsNotNone(first.canvas)
+		self.assertIsNone(second.canvas)
+
+	def test_mixed_group(self):
+		cloud = PointCloud([10, 10, 98, 98], 3)
+		shape = Rectangle(Point(40, 40), Point(50, 50))
+		path = os.path.join(tempfile.mkdtemp(), "tiles.png")
+		graphics.PILImage.new("RGB", (64, 64), "red").save(path)
+		tiled = TiledImage(Point(0, 60), Point(20, 80), path, tileSize = 16)
+		group = GraphicsGroup(cloud, shape, tiled)
+		group.draw(self.win)
+		group.setFill("blue")
+		self.assertEqual(cloud.config["fill"], "blue")
+		self.assertEqual(self.win.image.getpixel((10, 10)), BLUE)
+		group.move(-5, -5)
+		# the marker clipped by the window edge comes into view
+		self.assertEqual(self.win.image.getpixel((93, 93)), BLUE)
+		self.assertEqual(self.win.image.getpixel((40, 40)), BLUE)
+		self.assertEqual(self.win.image.getpixel((2, 57)), RED)
+		self.assertEqual(self.win.image.getpixel((17, 77)), WHITE)
+		tiled.move(30, 0)
+		# tiles laid out after the group was formed carry its tag
+		for item in self.win.find_withtag(tiled.tag):
+			self.assertIn(group.tag, self.win.gettags(item))
+		group.undraw()
+		self.assertEqual(list(self.win.find_all()), [])
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class BulkTest(unittest.TestCase):
+
+	def test_no_flush_without_autoflush(self):
+		win = OffscreenWin(100, 100)
+		flushes = []
+		win._update = lambda: flushes.append(1)
+		shapes = [Rectangle(Point(i, i), Point(i + 5, i + 5)) for i in range(0, 50, 10)]
+		drawAll(win, *shapes)
+		redrawAll(win, *shapes)
+		undrawAll(*shapes)
+		GraphicsGroup(shapes).draw(win)
+		self.assertEqual(flushes, [])
+		win.autoflush = True
+		undrawAll(*shapes)
+		self.assertEqual(flushes, [1])
+
+if __name__ == "__main__":
+	unittest.main()
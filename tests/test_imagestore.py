@@ -0,0 +1,86 @@
+"""Tests of the bounded, reference counted ImageStore behind graphics.Image"""
+
+import os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import ImageStore, Image, OffscreenWin, Point
+
+@unittest.skipUnless(graphics.HAS_PIL, "Images without Tk require PIL")
+class StoreTest(unittest.TestCase):
+
+	def setUp(self):
+		self.folder = tempfile.mkdtemp()
+		self.files = []
+		for i, size in enumerate([10, 20, 30]):
+			name = os.path.join(self.folder, "image%d.png" % i)
+			graphics.PILImage.new("RGB", (size, size), "red").save(name)
+			self.files.append(name)
+		self.store = ImageStore(budget = 2000)
+
+	def tearDown(self):
+		shutil.rmtree(self.folder)
+
+	def test_shared(self):
+		photo = self.store.load(self.files[0])
+		self.assertIs(self.store.load(self.files[0]), photo)
+		self.assertIsNot(self.store.load(self.files[1]), photo)
+		self.assertEqual((self.store.hits, self.store.misses), (1, 2))
+
+	def test_reference_counts(self):
+		photo = self.store.load(self.files[0])
+		self.store.acquire(photo)
+		self.store.acquire(photo)
+		self.store.release(photo)
+		self.assertEqual(self.store.stats()["drawn"], 1)
+		self.assertEqual(self.store.stats()["cached"], 0)
+		self.store.release(photo)
+		stats = self.store.stats()
+		self.assertEqual((stats["drawn"], stats["cached"], stats["cachedBytes"]), (0, 1, 400))
+		self.store.acquire(photo)
+		self.assertEqual((self.store.stats()["cached"], self.store.cachedBytes), (0, 0))
+		self.store.release(photo)
+		self.store.release(photo) # releasing too often is harmless
+		self.assertEqual(self.store.stats()["cached"], 1)
+
+	def test_eviction(self):
+		small, medium = self.store.load(self.files[0]), self.store.load(self.files[1])
+		for photo in (small, medium):
+			self.store.acquire(photo)
+			self.store.release(photo)
+		self.assertEqual((self.store.cachedBytes, self.store.evictions), (2000, 0))
+		self.store.acquire(small)
+		self.store.release(small) # now the most recently used
+		large = self.store.load(self.files[2])
+		self.store.acquire(large) # drawn images don't count against the budget
+		self.assertEqual(self.store.evictions, 0)
+		self.store.release(large)
+		self.assertEqual(list(self.store.cached.values()), [])
+		self.assertEqual(self.store.evictions, 3)
+		self.store.setBudget(4000)
+		for photo in (medium, small):
+			self.store.acquire(photo)
+			self.store.release(photo)
+		self.store.setBudget(1000)
+		self.assertEqual(list(self.store.cached.values()), [small])
+		self.store.clear()
+		self.assertEqual((len(self.store.cached), self.store.cachedBytes), (0, 0))
+
+	def test_drawn_images(self):
+		win = OffscreenWin(60, 60)
+		store = Image.store
+		first, second = Image(Point(20, 20), self.files[0]), Image(Point(40, 40), self.files[0])
+		self.assertIs(first.img, second.img)
+		first.draw(win)
+		second.draw(win)
+		self.assertEqual(store.drawn[id(first.img)][1], 2)
+		first.undraw()
+		self.assertEqual(store.drawn[id(first.img)][1], 1)
+		second.undraw()
+		self.assertNotIn(id(first.img), store.drawn)
+		self.assertIn(id(first.img), store.cached)
+		store.clear()
+
+if __name__ == "__main__":
+	unittest.main()
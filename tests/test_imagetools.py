@@ -0,0 +1,84 @@
+"""Tests of the vectorized image operations and pipelines of tk.imageTools"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics, imageTools
+from tk.graphics import GraphicsError, Image, Point
+from tk.imageTools import Pipeline, grayscale, threshold, convolve, resize, colorMap
+
+@unittest.skipUnless(imageTools.HAS_NUMPY, "image pipelines require NumPy")
+class OperationTest(unittest.TestCase):
+
+	def setUp(self):
+		numpy = imageTools.numpy
+		random = numpy.random.RandomState(0)
+		self.pixels = random.randint(0, 256, (37, 23, 3)).astype(numpy.uint8)
+
+	def test_grayscale(self):
+		gray = grayscale(self.pixels)
+		self.assertEqual(gray.shape, self.pixels.shape)
+		self.assertTrue((gray[:, :, 0] == gray[:, :, 2]).all())
+		r, g, b = [int(value) for value in self.pixels[3, 4]]
+		self.assertEqual(gray[3, 4, 0], (299 * r + 587 * g + 114 * b) // 1000)
+
+	def test_threshold(self):
+		values = set(threshold(self.pixels, 100).ravel().tolist())
+		self.assertTrue(values <= set([0, 255]))
+
+	def test_convolve(self):
+		identity = [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+		self.assertTrue((convolve(self.pixels, identity) == self.pixels).all())
+		flat = imageTools.numpy.full((5, 5, 3), 90, dtype = imageTools.numpy.uint8)
+		self.assertTrue((convolve(flat, imageTools.BOX_BLUR) == 90).all())
+		self.assertRaises(GraphicsError, convolve, self.pixels, [[1, 1], [1, 1]])
+
+	def test_resize(self):
+		self.assertEqual(resize(self.pixels, 10, 5).shape, (5, 10, 3))
+		self.assertTrue((resize(self.pixels, 23, 37) == self.pixels).all())
+
+	def test_color_map(self):
+		black = imageTools.numpy.zeros((1, 1, 3), dtype = imageTools.numpy.uint8)
+		self.assertEqual(colorMap(black, imageTools.HEAT)[0, 0].tolist(), [0, 0, 0])
+		self.assertEqual(colorMap(black + 255, ["#000000", (10, 20, 30)])[0, 0].tolist(), [10, 20, 30])
+		self.assertRaises(GraphicsError, colorMap, black, ["#000000"])
+
+@unittest.skipUnless(imageTools.HAS_NUMPY, "image pipelines require NumPy")
+class PipelineTest(unittest.TestCase):
+
+	def setUp(self):
+		numpy = imageTools.numpy
+		self.pixels = numpy.random.RandomState(1).randint(0, 256, (61, 40, 3)).astype(numpy.uint8)
+		self.pipeline = Pipeline().grayscale().convolve(imageTools.SHARPEN).resize(30, 50).convolve(imageTools.GAUSSIAN_BLUR).threshold(120)
+
+	def test_chained(self):
+		expected = self.pixels
+		for function, args in [(grayscale, ()), (convolve, (imageTools.SHARPEN,)), (resize, (30, 50)),
+				(convolve, (imageTools.GAUSSIAN_BLUR,)), (threshold, (120,))]:
+			expected = function(expected, *args)
+		self.assertEqual(len(self.pipeline), 5)
+		self.assertTrue((self.pipeline.run(self.pixels) == expected).all())
+
+	def test_stages(self):
+		halos = [halo for stage, halo in imageTools._stages(self.pipeline.operations)]
+		self.assertEqual(halos, [1, None, 1])
+
+	def test_workers_match(self):
+		# strips with halo rows give the same result as the whole image
+		single = self.pipeline.run(self.pixels)
+		self.assertTrue((self.pipeline.run(self.pixels, workers = 3) == single).all())
+
+	@unittest.skipUnless(graphics.HAS_PIL, "Images without Tk require PIL")
+	def test_apply(self):
+		image = Image(Point(10, 10), 40, 61)
+		image.setRegion(0, 0, self.pixels)
+		result = self.pipeline.apply(image)
+		self.assertIsNot(result, image)
+		self.assertEqual((result.getWidth(), result.getHeight()), (30, 50))
+		self.assertTrue((result.getRegion() == self.pipeline.run(self.pixels)).all())
+		same = Pipeline().grayscale().apply(image)
+		self.assertIs(same, image)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,50 @@
+"""Tests of hit-testing through the spatial index (GraphWin.objectsAt and objectsIn), run on an OffscreenWin"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, GraphicsGroup, Point, Rectangle
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class IndexTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+		self.shapes = [Rectangle(Point(10 + i, 10 + i), Point(30 + i, 30 + i)) for i in range(0, 15, 5)]
+		for shape in self.shapes:
+			shape.draw(self.win)
+
+	def hits(self):
+		return self.win.objectsAt(Point(25, 25))
+
+	def test_query(self):
+		self.assertEqual(self.win.objectsAt(Point(12, 12)), [self.shapes[0]])
+		self.assertEqual(self.win.objectsAt(Point(90, 90)), [])
+		self.assertEqual(self.win.objectsIn(Point(0, 0), Point(16, 16)), self.shapes[:2][::-1])
+		self.shapes[0].move(50, 50)
+		self.assertEqual(self.win.objectsAt(Point(70, 70)), [self.shapes[0]])
+		self.shapes[0].undraw()
+		self.assertEqual(self.win.objectsAt(Point(70, 70)), [])
+
+	def test_stacking_order(self):
+		first, second, third = self.shapes
+		self.assertEqual(self.hits(), [third, second, first])
+		self.win.tag_raise(first.id)
+		self.assertEqual(self.hits(), [first, third, second])
+		self.win.tag_lower(third.id)
+		self.assertEqual(self.hits(), [first, second, third])
+		self.win.tag_raise(third.id, second.id)
+		self.assertEqual(self.hits(), [first, third, second])
+		group = GraphicsGroup(second, third)
+		group.lift()
+		self.assertEqual(self.hits(), [third, second, first])
+
+	def test_query_reads_no_canvas_order(self):
+		self.win.tag_raise(self.shapes[0].id)
+		self.win.find_all = None # a hit test must not enumerate every canvas item
+		self.assertEqual(self.hits()[0], self.shapes[0])
+
+if __name__ == "__main__":
+	unittest.main()
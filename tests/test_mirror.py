@@ -0,0 +1,57 @@
+"""Tests of the save_image mirror, which draws a window's commands onto a PIL image on a background thread"""
+
+import os, sys, threading, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+
+RED, CLEAR = (255, 0, 0, 255), (0, 0, 0, 0)
+
+@unittest.skipUnless(graphics.HAS_PIL, "the mirror requires PIL")
+class MirrorTest(unittest.TestCase):
+
+	def setUp(self):
+		self.mirror = graphics._ImageMirror(20, 20)
+
+	def wait(self):
+		# a deadlocked wait fails the test instead of hanging it
+		result = []
+		thread = threading.Thread(target=lambda: result.append(self.mirror.wait()))
+		thread.daemon = True
+		thread.start()
+		thread.join(5)
+		self.assertTrue(result, "wait did not return")
+		return result[0]
+
+	def test_undraw_and_move(self):
+		self.mirror.draw(1, "rectangle", [0, 0, 4, 4], "red")
+		self.mirror.draw(2, "rectangle", [10, 10, 14, 14], "red")
+		self.assertEqual(self.wait().getpixel((2, 2)), RED)
+		self.mirror.undraw(1)
+		self.mirror.move(2, 5, 0)
+		image = self.wait()
+		self.assertEqual(image.getpixel((2, 2)), CLEAR)
+		self.assertEqual(image.getpixel((12, 12)), CLEAR)
+		self.assertEqual(image.getpixel((17, 12)), RED)
+
+	def test_clear(self):
+		self.mirror.draw(1, "rectangle", [0, 0, 4, 4], "red")
+		self.mirror.clear()
+		self.mirror.draw(2, "rectangle", [10, 10, 14, 14], "red")
+		image = self.wait()
+		self.assertEqual(image.getpixel((2, 2)), CLEAR)
+		self.assertEqual(image.getpixel((12, 12)), RED)
+
+	def test_after_stop(self):
+		self.mirror.draw(1, "rectangle", [0, 0, 4, 4], "red")
+		self.mirror.stop()
+		self.assertEqual(self.wait().getpixel((2, 2)), RED)
+		self.mirror.clear()
+		self.assertEqual(self.wait().getpixel((2, 2)), CLEAR)
+		self.mirror.draw(2, "rectangle", [10, 10, 14, 14], "red")
+		self.assertEqual(self.wait().getpixel((12, 12)), RED)
+		self.assertFalse(self.mirror.worker.is_alive())
+
+if __name__ == "__main__":
+	unittest.main()
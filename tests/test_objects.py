@@ -0,0 +1,43 @@
+"""Tests of the compact representation of graphics objects: __slots__ and shared configurations"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import Point, Rectangle, Oval, Circle, Line, Polygon, Polyline
+
+class SlotsTest(unittest.TestCase):
+
+	def test_no_instance_dict(self):
+		shapes = [Point(1, 2), Rectangle(Point(0, 0), Point(1, 1)), Oval(Point(0, 0), Point(1, 1)),
+			Circle(Point(0, 0), 1), Line(Point(0, 0), Point(1, 1)), Polygon(Point(0, 0), Point(1, 1), Point(2, 0)),
+			Polyline([0, 0, 1, 1])]
+		for shape in shapes:
+			self.assertFalse(hasattr(shape, "__dict__"), type(shape).__name__)
+
+	def test_clone_keeps_slots(self):
+		point = Point(1, 2).clone()
+		self.assertEqual((point.x, point.y, point.canvas, point.id), (1, 2, None, None))
+
+class SharedConfigTest(unittest.TestCase):
+
+	def test_shared_until_changed(self):
+		first, second = Rectangle(Point(0, 0), Point(1, 1)), Rectangle(Point(2, 2), Point(3, 3))
+		self.assertIs(first.config, second.config)
+		first.setFill("red")
+		self.assertIsNot(first.config, second.config)
+		self.assertEqual(first.config["fill"], "red")
+		self.assertEqual(second.config["fill"], graphics.DEFAULT_CONFIG["fill"])
+
+	def test_clone_shares_config(self):
+		shape = Circle(Point(0, 0), 1)
+		shape.setOutline("blue")
+		other = shape.clone()
+		self.assertIs(other.config, shape.config)
+		other.setOutline("green")
+		self.assertEqual(shape.config["outline"], "blue")
+		self.assertEqual(other.config["outline"], "green")
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,89 @@
+"""Tests of the drawing machinery of tk.graphics, run headless on an OffscreenWin"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import (OffscreenWin, GraphicsError, Point, Rectangle,
+	Polyline, PointCloud)
+
+WHITE, RED, BLUE = (255, 255, 255, 255), (255, 0, 0, 255), (0, 0, 255, 255)
+
+def box(win, item):
+	'''The screen coordinates of the canvas item of a drawn object'''
+	return [round(c, 6) for c in win.coords(item.id)]
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class DrawingTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+
+	def rectangle(self, x1, y1, x2, y2, color = "red"):
+		shape = Rectangle(Point(x1, y1), Point(x2, y2))
+		shape.setFill(color)
+		shape.setOutline(color)
+		return shape
+
+	def test_draw_move_undraw(self):
+		shape = self.rectangle(10, 10, 30, 30)
+		shape.draw(self.win)
+		self.assertEqual(self.win.image.getpixel((20, 20)), RED)
+		shape.move(50, 0)
+		self.assertEqual(box(self.win, shape), [60, 10, 80, 30])
+		self.assertEqual(self.win.image.getpixel((20, 20)), WHITE)
+		self.assertEqual(self.win.image.getpixel((70, 20)), RED)
+		shape.undraw()
+		self.assertEqual(list(self.win.find_all()), [])
+		self.assertIsNone(shape.canvas)
+		shape.draw(self.win)
+		self.assertRaises(GraphicsError, shape.draw, self.win)
+
+	def test_empty_polyline(self):
+		line = Polyline()
+		line.draw(self.win)
+		self.assertIsNone(line.id)
+		line.append(10, 10)
+		line.append(Point(90, 10))
+		line.extend([90, 90])
+		self.assertEqual(box(self.win, line), [10, 10, 90, 10, 90, 90])
+		self.assertEqual(self.win.objectsAt(Point(50, 10)), [line])
+
+	def test_empty_polyline_cleared(self):
+		line = Polyline()
+		line.draw(self.win)
+		self.win.clear()
+		self.assertIsNone(line.canvas)
+		line.extend([10, 10, 90, 90])
+		self.assertEqual(list(self.win.find_all()), [])
+		line.draw(self.win)
+		self.assertEqual(box(self.win, line), [10, 10, 90, 90])
+		empty = Polyline()
+		empty.draw(self.win)
+		empty.undraw()
+		self.assertIsNone(empty.canvas)
+		self.assertNotIn(empty, self.win._drawn())
+
+	def test_empty_polyline_culling(self):
+		line = Polyline()
+		line.draw(self.win)
+		self.win.setCulling(True)
+		line.append(10, 10)
+		self.assertIsNotNone(line.id)
+		other = Polyline()
+		other.draw(self.win)
+		self.win.setCulling(False)
+		other.append(20, 20)
+		self.assertIn(other, self.win.objectsAt(Point(20, 20)))
+		self.win.clear()
+		self.assertIsNone(other.canvas)
+
+	def test_point_cloud_raw_coordinates(self):
+		cloud = PointCloud([10, 10, 20.4, 20.6], 1)
+		cloud.setFill("red")
+		cloud.draw(self.win)
+		self.assertEqual(self.win.image.getpixel((10, 10)), RED)
+
+if __name__ == "__main__":
+	unittest.main()
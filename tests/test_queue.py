@@ -0,0 +1,107 @@
+"""Tests of GraphWin.post, submit and runQueue, which let other threads draw"""
+
+import os, sys, threading, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, GraphicsError, Point, Rectangle
+
+def inThread(function, *args):
+	'''Runs function(*args) on a new thread and returns its result'''
+	results = []
+	worker = threading.Thread(target = lambda: results.append(function(*args)))
+	worker.start()
+	worker.join(5)
+	return results[0]
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class QueueTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+		self.ran = []
+
+	def test_own_thread(self):
+		self.assertEqual(self.win.post(lambda: self.ran.append(1) or "done"), "done")
+		self.assertEqual(self.ran, [1])
+		self.assertEqual(self.win.runQueue(), 0)
+
+	def test_order_and_limit(self):
+		def produce():
+			for i in range(10):
+				self.win.post(self.ran.append, i)
+		inThread(produce)
+		self.assertEqual(self.ran, [])
+		self.assertEqual(self.win.runQueue(4), 4)
+		self.assertEqual(self.ran, [0, 1, 2, 3])
+		self.assertEqual(self.win.runQueue(), 6)
+		self.assertEqual(self.ran, list(range(10)))
+
+	def test_one_flush(self):
+		shapes = [Rectangle(Point(i, i), Point(i + 5, i + 5)) for i in range(20)]
+		def produce():
+			for shape in shapes:
+				self.win.post(shape.draw, self.win)
+		inThread(produce)
+		flushes = []
+		self.win.autoflush = True
+		self.win._update = lambda: flushes.append(1)
+		self.win.runQueue()
+		self.assertEqual(len(flushes), 1)
+		self.assertEqual(len(self.win.find_all()), 20)
+
+	def test_errors_reported(self):
+		reported = []
+		hook, sys.excepthook = sys.excepthook, lambda *info: reported.append(info[0])
+		try:
+			def produce():
+				self.win.post(lambda: 1 / 0)
+				self.win.post(self.ran.append, "after")
+			inThread(produce)
+			self.win.runQueue()
+		finally:
+			sys.excepthook = hook
+		self.assertEqual(reported, [ZeroDivisionError])
+		self.assertEqual(self.ran, ["after"])
+
+	@unittest.skipIf(graphics.Future is None, "submit requires concurrent.futures")
+	def test_submit(self):
+		good = inThread(self.win.submit, lambda x: x * 2, 21)
+		bad = inThread(self.win.submit, lambda: 1 / 0)
+		self.assertFalse(good.done())
+		self.win.runQueue()
+		self.assertEqual(good.result(0), 42)
+		self.assertRaises(ZeroDivisionError, bad.result, 0)
+
+	def test_closed(self):
+		self.win.close()
+		def produce():
+			try:
+				self.win.post(self.ran.append, 1)
+			except GraphicsError as error:
+				return error
+		self.assertIsInstance(inThread(produce), GraphicsError)
+
+	def test_wake_up(self):
+		# windows with a Tk root are woken through a pipe; here the test plays Tk's part
+		self.win._wakeFds = read, write = os.pipe()
+		try:
+			def produce():
+				for i in range(3):
+					self.win.post(self.ran.append, i)
+			inThread(produce)
+			self.assertTrue(self.win._woken)
+			self.assertEqual(os.read(read, 64), b"!") # one wake-up for the three commands
+			os.write(write, b"!")
+			self.win._onQueueWake(read, 0)
+			self.assertEqual(self.ran, [0, 1, 2])
+			self.assertFalse(self.win._woken)
+			self.assertIsNone(self.win._queueTimer)
+		finally:
+			self.win._wakeFds = None
+			os.close(read)
+			os.close(write)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,50 @@
+"""Tests of bulk pixel access on graphics.Image (getRegion and setRegion), with Images backed by PIL"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import GraphicsError, Image, Point
+
+@unittest.skipUnless(graphics.HAS_PIL, "Images without Tk require PIL")
+class RegionTest(unittest.TestCase):
+
+	def setUp(self):
+		self.image = Image(Point(0, 0), 8, 4)
+
+	@unittest.skipUnless(graphics.HAS_NUMPY, "requires NumPy")
+	def test_array_region(self):
+		numpy = graphics.numpy
+		block = numpy.zeros((2, 3, 3), dtype = numpy.uint8)
+		block[:, :, 0] = 255
+		self.image.setRegion(1, 1, block)
+		region = self.image.getRegion(0, 0, 4, 3)
+		self.assertEqual(region.shape, (3, 4, 3))
+		self.assertEqual(list(region[1, 1]), [255, 0, 0])
+		self.assertEqual(list(region[0, 0]), [0, 0, 0])
+		self.assertEqual(self.image.getPixel(3, 2), [255, 0, 0])
+		self.assertEqual(self.image.getRegion().shape, (4, 8, 3))
+		self.assertRaises(GraphicsError, self.image.setRegion, 0, 0, numpy.zeros((2, 2)))
+
+	@unittest.skipUnless(graphics.HAS_NUMPY, "requires NumPy")
+	def test_round_trip(self):
+		numpy = graphics.numpy
+		pixels = numpy.arange(8 * 4 * 3, dtype = numpy.uint8).reshape(4, 8, 3)
+		self.image.setRegion(0, 0, pixels)
+		self.assertTrue((self.image.getRegion() == pixels).all())
+
+	def test_bytes_region(self):
+		self.image.setRegion(2, 0, bytes(bytearray([0, 255, 0])) * 4, 2)
+		self.assertEqual(self.image.getPixel(3, 1), [0, 255, 0])
+		self.assertEqual(self.image.getPixel(1, 1), [0, 0, 0])
+		self.assertRaises(GraphicsError, self.image.setRegion, 0, 0, b"\0\0\0")
+
+	def test_clone_keeps_its_pixels(self):
+		other = self.image.clone()
+		self.image.setRegion(0, 0, bytes(bytearray([255, 0, 0])), 1)
+		self.assertEqual(self.image.getPixel(0, 0), [255, 0, 0])
+		self.assertEqual(other.getPixel(0, 0), [0, 0, 0])
+
+if __name__ == "__main__":
+	unittest.main()
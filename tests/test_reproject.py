@@ -0,0 +1,69 @@
+"""Tests of setCoords(..., reproject = True), which moves drawn objects into the new coordinates"""
+
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, Point, Rectangle, Polyline, PointCloud, Text, Transform
+
+def box(win, item):
+	'''The screen coordinates of the canvas item of a drawn object'''
+	return [round(c, 6) for c in win.coords(item.id)]
+
+@unittest.skipUnless(graphics.HAS_PIL, "OffscreenWin requires PIL")
+class ReprojectTest(unittest.TestCase):
+
+	def setUp(self):
+		self.win = OffscreenWin(100, 100)
+
+	def drawBoth(self, *shapes):
+		# draws shapes in self.win and clones of them in a window already in the new coordinates
+		other = OffscreenWin(100, 100)
+		other.setCoords(-10, -10, 10, 10)
+		for shape in shapes:
+			shape.draw(self.win)
+			shape.clone().draw(other)
+		self.win.setCoords(-10, -10, 10, 10, reproject = True)
+		return other
+
+	def test_reproject(self):
+		self.win.setCoords(0, 0, 10, 10)
+		shape = Rectangle(Point(2, 2), Point(4, 4))
+		shape.setFill("red")
+		line = Polyline([1, 1, 5, 5, 9, 1])
+		other = self.drawBoth(shape, line)
+		ids = list(other.find_all())
+		self.assertEqual([box(self.win, shape), box(self.win, line)],
+			[[round(c, 6) for c in other.coords(item)] for item in ids])
+		self.assertEqual(self.win.image.tobytes(), other.image.tobytes())
+
+	def test_from_pixels(self):
+		shape = Rectangle(Point(50, 50), Point(60, 60))
+		label = Text(Point(25, 75), "label")
+		other = self.drawBoth(shape, label)
+		ids = list(other.find_all())
+		self.assertEqual(box(self.win, shape), [round(c, 6) for c in other.coords(ids[0])])
+		self.assertEqual(box(self.win, label), [round(c, 6) for c in other.coords(ids[1])])
+
+	def test_point_cloud(self):
+		self.win.setCoords(0, 0, 10, 10)
+		cloud = PointCloud([1, 1, 5, 5, 9, 9], 2)
+		cloud.setFill("blue")
+		other = self.drawBoth(cloud)
+		self.assertEqual(self.win.image.tobytes(), other.image.tobytes())
+
+	def test_without_reproject(self):
+		shape = Rectangle(Point(50, 50), Point(60, 60))
+		shape.draw(self.win)
+		self.win.setCoords(-10, -10, 10, 10)
+		self.assertEqual(box(self.win, shape), [50, 50, 60, 60])
+
+	def test_map_from(self):
+		old, new = Transform(100, 100, 0, 0, 10, 10), Transform(100, 100, -10, -10, 10, 10)
+		ax, bx, ay, by = new.mapFrom(old)
+		x, y = old.screen(4, 7)
+		self.assertEqual([round(v, 6) for v in (ax * x + bx, ay * y + by)], [round(v, 6) for v in new.screen(4, 7)])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,92 @@
+"""Tests of TiledImage, which shows very large images a tile at a time"""
+
+import os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tk import graphics
+from tk.graphics import OffscreenWin, Point, TiledImage
+
+RED, GREEN, BLUE, WHITE = (255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255), (255, 255, 255, 255)
+
+@unittest.skipUnless(graphics.HAS_PIL, "TiledImage requires PIL")
+class TiledTest(unittest.TestCase):
+
+	def setUp(self):
+		self.folder = tempfile.mkdtemp()
+		self.path = os.path.join(self.folder, "large.png")
+		# red on the left half, green on the right, with a blue bottom right quarter
+		image = graphics.PILImage.new("RGB", (400, 200), "red")
+		image.paste((0, 255, 0), (200, 0, 400, 200))
+		image.paste((0, 0, 255), (200, 100, 400, 200))
+		image.save(self.path)
+		self.win = OffscreenWin(100, 50)
+
+	def tearDown(self):
+		shutil.rmtree(self.folder)
+
+	def test_full_size(self):
+		tiled = TiledImage(Point(0, 0), Point(400, 200), self.path, tileSize = 32)
+		self.assertEqual((tiled.getWidth(), tiled.getHeight()), (400, 200))
+		tiled.draw(self.win)
+		self.assertEqual(self.win.image.getpixel((50, 25)), RED)
+		# only the tiles in view are shown
+		self.assertEqual(len(self.win.find_withtag(tiled.tag)), 4 * 2)
+		tiled.move(-350, -170)
+		self.assertEqual(self.win.image.getpixel((10, 10)), BLUE)
+		self.assertEqual(self.win.image.getpixel((10, 40)), WHITE)
+		self.assertEqual(self.win.image.getpixel((60, 10)), WHITE)
+
+	def test_levels(self):
+		# the whole image in a quarter of the pixels samples a coarser level
+		tiled = TiledImage(Point(0, 0), Point(100, 50), self.path, tileSize = 16)
+		tiled.draw(self.win)
+		self.assertTrue(all(key[0] == 2 for key in tiled.items))
+		self.assertEqual(self.win.image.getpixel((20, 20)), RED)
+		self.assertEqual(self.win.image.getpixel((80, 10)), GREEN)
+		self.assertEqual(self.win.image.getpixel((80, 40)), BLUE)
+
+	@unittest.skipUnless(graphics.HAS_NUMPY, ".npy files require NumPy")
+	def test_array_matches_file(self):
+		array = os.path.join(self.folder, "large.npy")
+		graphics.numpy.save(array, graphics.numpy.asarray(graphics.PILImage.open(self.path)))
+		other = OffscreenWin(100, 50)
+		for win, name in ((self.win, self.path), (other, array)):
+			TiledImage(Point(0, 0), Point(200, 100), name, tileSize = 32).draw(win)
+		self.assertEqual(self.win.image.tobytes(), other.image.tobytes())
+
+	def test_past_the_pixel_limit(self):
+		limit = graphics.PILImage.MAX_IMAGE_PIXELS
+		graphics.PILImage.MAX_IMAGE_PIXELS = 1000
+		try:
+			tiled = TiledImage(Point(0, 0), Point(400, 200), self.path)
+			tiled.draw(self.win)
+			self.assertEqual(self.win.image.getpixel((50, 25)), RED)
+			self.assertEqual(graphics.PILImage.MAX_IMAGE_PIXELS, 1000)
+		finally:
+			graphics.PILImage.MAX_IMAGE_PIXELS = limit
+
+	def test_undraw_releases_the_pixels(self):
+		tiled = TiledImage(Point(0, 0), Point(400, 200), self.path, tileSize = 32)
+		tiled.draw(self.win)
+		source = tiled.source
+		self.assertIsNotNone(source.image)
+		path = source.path
+		self.assertTrue(os.path.exists(path))
+		tiled.undraw()
+		self.assertIsNone(source.image)
+		self.assertEqual(list(self.win.find_all()), [])
+		tiled.draw(self.win)
+		self.assertEqual(source.path, path) # converted only once
+		self.assertEqual(self.win.image.getpixel((50, 25)), RED)
+
+	def test_temporary_file_removed(self):
+		source = graphics._PILTiles(self.path)
+		self.assertEqual(source.region((200, 100, 232, 132), 1).size, (16, 16))
+		path = source.path
+		self.assertTrue(os.path.exists(path))
+		del source
+		self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+	unittest.main()
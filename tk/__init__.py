@@ -10,6 +10,7 @@ There are various functions and classes that are available.
 MODULES:
 	graphics
 	graphTools
+	imageTools
 	tkBase
 	tkExtra
 	ttkExtra
@@ -30,15 +31,22 @@ except ImportError:
 	from tkinter import *
 import tk.graphTools
 import tk.graphics
-import tk.tkBase
-import tk.tkExtra
-import tk.ttkExtra
+import tk.imageTools
+try:
+	import tk.tkBase
+	import tk.tkExtra
+	import tk.ttkExtra
+except TclError:
+	# no display: tkBase needs a Tk root window, but graphics and graphTools
+	#	can still draw offscreen (see graphics.OffscreenWin)
+	pass
 
 modules = {
 	'base': [
 		'__init__.py',
 		'graphics.py',
 		'graphTools.py', 
+		'imageTools.py',
 		'tkExtra.py',
 		'ttkExtra.py',
 		'tkBase.py'
@@ -131,10 +131,8 @@ class Pixel(object):
 class Graph(GraphWin):
 	'''Class to graph a function
 	Accepts the following keyword arguments:
-	width, height, autoflush, xMin, xMax, yMin, yMax, background'''
+	width, height, autoflush, xMin, xMax, yMin, yMax, background, raster, record'''
 	def __init__(self, master = None, function = None, **options):
-		if not master:
-			master = tk.Tk()
 		if function and not isinstance(function, Function):
 			function = Function(function)
 		self.master, self.function, self.options = master, function, options
@@ -142,8 +140,10 @@ class Graph(GraphWin):
 		self.xMin, self.xMax, self.yMin, self.yMax = self.options.get('xMin', -100), self.options.get('xMax', 100), self.options.get('yMin', -100), self.options.get('yMax', 100)
 		self.background, self.save_image = self.options.get('background', 'white'), self.options.get('save_image', None)
 		self.update = self.options.get('update', lambda *args: None)
-		GraphWin.__init__(self, self.master, self.width, self.height, self.autoflush, save_image = self.save_image)
+		GraphWin.__init__(self, self.master, self.width, self.height, self.autoflush, save_image = self.save_image, raster = self.options.get('raster', False))
 		self.setBackground(self.background)
+		if self.options.get('record', False):
+			self.record()
 		self.graphed, self.axes_drawn, self.xAxis, self.yAxis, self.variables, self.axes_args, self.graph_args = False, False, None, None, {}, [], []
 		self.defaultZoom = {'coords': [self.xMin, self.yMin, self.xMax, self.yMax], 'center': [0, 0]}
 		self.setCoords(self.xMin, self.yMin, self.xMax, self.yMax)
@@ -173,10 +173,10 @@ class Graph(GraphWin):
 			return self.translate(x, y, GLOBAL)
 		return x, y
 		 
-	def setCoords(self, x1, y1, x2, y2, default = False):
-		'''Sets the coordinates of the main graph'''
+	def setCoords(self, x1, y1, x2, y2, default = False, reproject = False):
+		'''Sets the coordinates of the main graph; with reproject = True, the drawn objects are moved to their places in the new coordinates'''
 		self.xMin, self.yMin, self.xMax, self.yMax = x1, y1, x2, y2
-		GraphWin.setCoords(self, self.xMin, self.yMin, self.xMax, self.yMax)
+		GraphWin.setCoords(self, self.xMin, self.yMin, self.xMax, self.yMax, reproject)
 		if default:
 			self.defaultZoom['coords'] = [self.xMin, self.yMin, self.xMax, self.yMax]
 			self.defaultZoom['center'] = self.getCenter()
@@ -223,6 +223,9 @@ class Graph(GraphWin):
 		xMin, yMin = centerX - xShift / (ratioX * 2), centerY -  yShift / (ratioY * 2)
 		xMax, yMax = centerX + xShift / (ratioX * 2), centerY + yShift / (ratioY * 2)
 		self.setCoords(xMin, yMin, xMax, yMax)
+		if self.isCulling():
+			# setCoords has already drawn the objects in the new coordinates
+			return
 		if scale:
 			self.scale("all", 0, 0, ratioX, ratioY)
 			self.move("all", xShiftPixel, yShiftPixel)
@@ -230,16 +233,22 @@ class Graph(GraphWin):
 			self.refresh()
 		
 	def refresh(self, redrawGraph = True):
-		'''Refreshes the graph - use if set new coords'''
-		self.clear()
-		if self.axes_drawn:
-			self.drawAxes(*self.axes_args)
-		if self.graphed and redrawGraph:
-			if self.graph_dict['custom']:
-				self.graph_dict['custom']()
-			else:
-				self.graph_dict[self.graphed](*self.graph_args[:-1], **self.graph_args[-1])
-				self.update()
+		'''Refreshes the graph - use if set new coords
+		If the graph is recording (record = True), the recorded drawing is redrawn instead of recomputed.
+		The graph is redrawn in a single batch, so with double buffering on it is swapped in whole'''
+		with self.batch():
+			if self.isRecording() and redrawGraph:
+				self._redraw()
+				return
+			self.clear()
+			if self.axes_drawn:
+				self.drawAxes(*self.axes_args)
+			if self.graphed and redrawGraph:
+				if self.graph_dict['custom']:
+					self.graph_dict['custom']()
+				else:
+					self.graph_dict[self.graphed](*self.graph_args[:-1], **self.graph_args[-1])
+					self.update()
 		
 	def setCustomGraph(self, function):
 		'''Sets the custom graphing function'''
@@ -357,16 +366,14 @@ class Graph(GraphWin):
 					self.points = points
 				thread = threading.Thread(target = thread_process, args = ())
 				return thread
+			line = Polyline(oldX, oldY)
+			line.setOutline(color)
+			line.draw(self)
 			for x in iter(values):
 				try:
 					self.setVariable(self.main_variable, x)
 					y = self.function.evaluate(**self.variables)
-					line = Line(Point(oldX, oldY), Point(x, y))
-					line.setOutline(color)
-					try:
-						line.draw(self)
-					except GraphicsError:
-						break
+					line.append(x, y)
 					oldX, oldY = x, y
 					update_function(x, y, x / total)
 				except ZeroDivisionError:
@@ -375,6 +382,13 @@ class Graph(GraphWin):
 					circle.draw(self)
 			self.graphed = 'graph'
 
+class OffscreenGraph(OffscreenWin, Graph):
+	'''A Graph that draws into an in-memory image instead of a window (see graphics.OffscreenWin),
+	for rendering graphs to files without a display. Accepts the same keyword arguments as Graph'''
+	def __init__(self, function = None, **options):
+		options.setdefault('raster', True)
+		Graph.__init__(self, None, function, **options)
+
 class ComplexGraph(Graph):
 	'''Wrapper to the Graph class that allows for the graphing of Complex numbers'''
 	def __contains__(self, z):
@@ -497,6 +511,10 @@ class PolynomialMap(Graph):
 			self.createVariable(iter_variable)
 			total = stop - start
 			offset = 0.5 if use_threading else 1
+			if use_threading:
+				# the progress callback may draw, so it runs on the Tk thread
+				report = update_function
+				update_function = lambda *args: self.post(report, *args)
 			def thread_process():
 				points = []
 				for value in decRange(start, stop, total / iterations):
@@ -566,9 +584,9 @@ class GraphGroup:
 		'''Packs the graphs'''
 		self.iter_graphs(Graph.pack, *args, **kwargs)
 	
-	def setCoords(self, x1, y1, x2, y2, default = False):
+	def setCoords(self, x1, y1, x2, y2, default = False, reproject = False):
 		'''Sets the coordinates for the graphs'''
-		self.iter_graphs(Graph.setCoords, x1, y1, x2, y2, default)
+		self.iter_graphs(Graph.setCoords, x1, y1, x2, y2, default, reproject)
 	
 	def resetZoom(self):
 		'''Resets the zoom for the graphs'''
@@ -703,6 +721,14 @@ class ColorScheme:
 		'''Returns the color based on the current scheme'''
 		return self.current(*variables)
 			
+class Axis(Line):
+	'''A Line with the tick marks and labels drawn along it (set by drawAxis)'''
+	__slots__ = ("labels",)
+
+	def __init__(self, p1, p2):
+		Line.__init__(self, p1, p2)
+		self.labels = []
+
 ### Additional Functions
 
 def drawAxis(window, min_point, max_point, label = False, lineLen = None, interval = None, placePoint = None, type = 'x', color = 'black'):
@@ -710,7 +736,7 @@ def drawAxis(window, min_point, max_point, label = False, lineLen = None, interv
 	window is a GraphWin object, the points are Point objects, and the label is a Boolean
 	returns a Line object'''
 	truncate = lambda s, length: s[:length]
-	axis = Line(min_point, max_point)
+	axis = Axis(min_point, max_point)
 	try:
 		xLength, yLength = window.xMax - window.xMin, window.yMax - window.yMin
 		yAdjust = yLength / xLength
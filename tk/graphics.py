@@ -49,9 +49,12 @@ The library provides the following graphical objects:
 	Oval
 	Rectangle
 	Polygon
+	Polyline
+	PointCloud
 	Text
 	Entry (for text-based input)
 	Image
+	GraphicsGroup (for handling many objects at once)
 
 Various attributes of graphical objects can be set such as
 outline-color, fill-color and line-width. Graphical objects also
@@ -98,10 +101,37 @@ Notes:
 	the Canvas itself is gridded at (row = 0, column = 0) by default
 '''	
 
+# Version 5.2 10/17/2026
+#		* GraphWin.batch() (or begin() and commit()) defers the per-object flushes until the batch is committed
+#		* GraphWin(..., raster = True) plots pixels into a single PhotoImage instead of one canvas item per pixel
+#		* GraphWin.plotMany and GraphWin.plotPixels plot sequences (or NumPy arrays) of points in one operation
+#		* Transform.screen/world, GraphWin.toScreen/toWorld and GraphWin.translate/translateCustom accept sequences of coordinates
+#		* getMouse blocks on Tk events instead of polling (with an optional timeout)
+#		* asyncio support: await win.mouse(), win.key() and win.frame(), with runAsync/startAsync driving Tk from the asyncio loop
+#		* GraphWin.objectsAt and GraphWin.objectsIn find drawn objects through a grid index over their bounding boxes
+#		* Point and the shape classes use __slots__ and share their configuration until it is first changed
+#		* Added Polyline and PointCloud, which draw any number of points as a single canvas item
+#		* Added GraphicsGroup, which moves, restyles and undraws its members through one shared canvas tag
+#		* drawAll, undrawAll and redrawAll flush each window once
+#		* The save_image mirror is drawn on a background thread and now follows undraw and move
+#		* GraphWin.record keeps a DisplayList of the drawing, which can be replayed onto any window, saved and loaded
+#		* Added OffscreenWin, which draws into a PIL image without Tk or a display
+#		* Image.getRegion and Image.setRegion read and write blocks of pixels in one operation
+#		* Images keep their PhotoImages in a bounded ImageStore; images of the same file and clones share one PhotoImage
+#		* Added TiledImage, which shows very large images by decoding only the tiles in view
+#		* GraphWin.setCulling leaves drawn objects that lie outside the window's coordinates off the canvas
+#		* GraphWin.clear detaches the drawn objects in bulk, with one canvas delete and one flush
+#		* GraphWin.setCoords(..., reproject = True) moves the drawn objects to their places in the new coordinates
+#		* GraphWin.animate calls a step function at a steady frame rate, flushing once per frame and dropping frames when behind
+#		* GraphWin.setDoubleBuffer and GraphWin.buffered build each batch hidden and swap it in at once, so a redraw never shows half drawn
+#		* Entry widgets are pooled per window: undrawing an Entry returns its widgets for the next Entry drawn there to reuse
+#		* GraphWin.post and GraphWin.submit queue drawing from other threads; the Tk thread runs it in bounded batches
+#		* GraphWin.setMotionHandler and setDragHandler report mouse motion at most once a frame; clicks and keys are queued
+#			(getMouse, checkMouse and the new getKey and checkKey), so fast clicks and key presses are not lost
 # Version 5.1 12/23/2013
 #		* Allows saving of window using the Python Imaging Library (PIL) to an image file
 #			- This is set within the constructor: GraphWin(..., save_image = True). By default, it is False.
-#		* Currently, does not support undrawing of objects from the image
+#		* Currently, does not support undrawing of objects from the image (see Version 5.2)
 # Version 5.0 4/6/2013
 #		* Allows mixing with Tkinter
 #
@@ -190,7 +220,9 @@ Notes:
 #     Added ability to set text atttributes.
 #     Added Entry boxes.
 
-import time, os, sys
+import time, os, sys, math, weakref
+import contextlib, array, collections, threading
+import base64, struct, zlib, io, re, binascii, mmap, tempfile
 
 try:
 	 # import as appropriate for 2.x vs. 3.x
@@ -199,11 +231,36 @@ except ImportError:
 	import Tkinter as tkinter
 
 try:
-	import Image as PILImage
-	import ImageDraw
+	import queue
+except ImportError:
+	import Queue as queue
+
+try:
+	from PIL import Image as PILImage, ImageDraw, ImageColor, ImageFont
 	HAS_PIL = True
 except ImportError:
-	HAS_PIL = False
+	try:
+		import Image as PILImage
+		import ImageDraw, ImageColor, ImageFont
+		HAS_PIL = True
+	except ImportError:
+		HAS_PIL = False
+
+try:
+	import numpy
+	HAS_NUMPY = True
+except ImportError:
+	HAS_NUMPY = False
+
+try:
+	import asyncio
+except ImportError:
+	asyncio = None
+
+try:
+	from concurrent.futures import Future
+except ImportError:
+	Future = None
 	
 ##########################################################################
 # Module Exceptions
@@ -222,22 +279,89 @@ DEAD_THREAD = "Graphics thread quit unexpectedly"
 LOCAL = "local"
 GLOBAL = "global"
 
+_CULL_MARGIN = 8 # pixels around the bounds of an object that still count as in view when culling
+_FRAME_TAG = "graphics-frame" # the hidden items of a double-buffered frame
+_STALE_TAG = "graphics-stale" # the items a double-buffered frame replaces
+_QUEUE_SIZE = 10000 # commands posted from other threads that may wait before post blocks
+_QUEUE_BATCH = 500 # commands run per tick of the queue timer
+_QUEUE_INTERVAL = 20 # milliseconds between checks of the queue, where Tk can't watch a pipe
+_EVENT_QUEUE_SIZE = 64 # clicks and key presses kept until they are asked for
+_FRAME_MS = 16 # milliseconds over which mouse motion is coalesced
+_TILE_BAND = 512 # rows of a TiledImage file converted at a time
+
+_root = None
+_asyncPump = None
+_clock = getattr(time, "perf_counter", time.time)
+_memberships = weakref.WeakKeyDictionary() # GraphicsObject -> WeakSet of the GraphicsGroups it belongs to
+
 def update():
 	global _root
 	_root.update()
 
+def startAsync(loop = None, interval = 0.008):
+	'''Drives the Tk event loop from an asyncio event loop (the current one by default), so coroutines
+	awaiting GraphWin.mouse, key or frame can run next to other asyncio tasks in the same thread.
+	Pending Tk events are handled as soon as the loop gets to them; when Tk is idle, it is checked again
+	after interval seconds'''
+	global _asyncPump
+	if asyncio is None:
+		raise GraphicsError("asyncio is not available")
+	stopAsync()
+	_asyncPump = _AsyncPump(loop or asyncio.get_event_loop(), interval)
+	_asyncPump.tick()
+
+def stopAsync():
+	'''Stops driving the Tk event loop from asyncio'''
+	global _asyncPump
+	if _asyncPump:
+		_asyncPump.stop()
+		_asyncPump = None
+
+def runAsync(main, interval = 0.008):
+	'''Runs the coroutine main to completion on a new asyncio event loop that also drives Tk; returns its result'''
+	if asyncio is None:
+		raise GraphicsError("asyncio is not available")
+	loop = asyncio.new_event_loop()
+	asyncio.set_event_loop(loop)
+	startAsync(loop, interval)
+	try:
+		return loop.run_until_complete(main)
+	finally:
+		stopAsync()
+		loop.close()
+
+class _AsyncPump:
+
+	"""Internal class that handles pending Tk events from an asyncio loop"""
+
+	def __init__(self, loop, interval):
+		self.loop = loop
+		self.interval = interval
+		self.handle = None
+
+	def tick(self):
+		handled = 0
+		if _root is not None:
+			try:
+				while _root.tk.dooneevent(tkinter._tkinter.ALL_EVENTS | tkinter._tkinter.DONT_WAIT):
+					handled += 1
+			except tkinter.TclError:
+				pass
+		self.handle = self.loop.call_later(0 if handled else self.interval, self.tick)
+
+	def stop(self):
+		if self.handle:
+			self.handle.cancel()
+			self.handle = None
+
 ############################################################################
 # Graphics classes start here
 
 class GraphWin(tkinter.Canvas):
 	"""A GraphWin is a toplevel window for displaying graphics."""
-	def __init__(self, master = None, width = 200, height = 200, autoflush = True, row = None, column = None, padx = None, pady = None, title = "Graphics Window", save_image = False):
-		global _root
-		if master is None:
-			master = tkinter.Tk(className = ' ' + title)
-		_root = master
+	def __init__(self, master = None, width = 200, height = 200, autoflush = True, row = None, column = None, padx = None, pady = None, title = "Graphics Window", save_image = False, raster = False):
 		self.width, self.height = width, height
-		tkinter.Canvas.__init__(self, master, width=width, height=height)
+		master = self._initSurface(master, title)
 		if row or column or padx or pady:
 			if not row:
 				row = 0
@@ -252,15 +376,22 @@ class GraphWin(tkinter.Canvas):
 			self.save_image = False
 		else:
 			self.save_image = save_image
+		self._mirror = None
 		if self.save_image:
-			self.image = PILImage.new('RGBA', (self.width, self.height))
-			self.drawing_image = ImageDraw.Draw(self.image)
+			self._mirror = _ImageMirror(self.width, self.height)
 			self.image_path = 'tk_graphTools_Graph_image.jpg'
 		self.foreground = "black"
 		self.items = []
 		self.mouseX = None
 		self.mouseY = None
-		self.bind("<Button-1>", self._onClick)
+		self.lastKey = None
+		self._clickQueue = collections.deque(maxlen = _EVENT_QUEUE_SIZE) # screen positions of unread clicks
+		self._keyQueue = collections.deque(maxlen = _EVENT_QUEUE_SIZE) # keysyms of unread key presses
+		self._motionHandlers = {} # event sequence -> handler
+		self._motionBindings = {}
+		self._motionPending = {} # event sequence -> latest screen position, until it is delivered
+		self._mouseWaiters = []
+		self._keyWaiters = []
 		self.height = height
 		self.width = width
 		self.autoflush = autoflush
@@ -268,9 +399,43 @@ class GraphWin(tkinter.Canvas):
 		self.trans = None
 		self.closed = False
 		self.all_objects = {}
-		master.lift()
+		self._batchDepth = 0
+		self.raster = raster
+		self._pixelLayer = None
+		self._index = None
+		self._stackTop = self._stackBottom = 0 # the stacking numbers of the topmost and bottommost objects
+		self._stackDirty = False # whether the stacking numbers must be read again from the canvas
+		self._recording = None
+		self._viewers = [] # drawn objects that lay themselves out again when the coordinates change
+		self._culling = None # with culling on, the drawn objects in drawing order (see setCulling)
+		self._pending = collections.OrderedDict() # drawn objects without a canvas item yet (empty Polylines)
+		self._doubleBuffer = False
+		self._frame = None # while a double-buffered frame is built, the pixel layers it replaces
+		self._entryPool = [] # the (frame, entry) widgets of undrawn Entries, for reuse
+		self._thread = threading.current_thread() # the thread that runs Tk
+		self._commands = queue.Queue(_QUEUE_SIZE) # commands posted from other threads
+		self._queueTimer = None # the pending after call that runs the queue
+		self._wakeFds = None # the pipe through which post wakes the Tk thread
+		self._woken = False # whether a wake-up is on its way through the pipe
+		if self.master is not None:
+			self._listenQueue()
 		if autoflush:
-			_root.update()
+			self._update()
+
+	def _initSurface(self, master, title):
+		'''Internal: creates the canvas (in a new toplevel window unless master is given)
+		and binds its events; returns the master'''
+		global _root
+		if master is None:
+			master = tkinter.Tk(className = ' ' + title)
+		_root = master
+		tkinter.Canvas.__init__(self, master, width=self.width, height=self.height)
+		self._clicks = tkinter.IntVar(master, 0)
+		self.bind("<Button-1>", self._onClick)
+		self.bind("<Destroy>", self._onDestroy, "+")
+		self.winfo_toplevel().bind("<Key>", self._onKey, "+")
+		master.lift()
+		return master
 	
 	def __checkOpen(self):
 		if self.closed:
@@ -280,35 +445,69 @@ class GraphWin(tkinter.Canvas):
 		"""Set background color of the window"""
 		self.__checkOpen()
 		self.config(bg=color)
-		self.__autoflush()
+		self._autoflush()
 		
 	def title(self, name):
 		'''Titles the main'''
 		self.master.title(name)
 		
-	def setCoords(self, x1, y1, x2, y2):
+	def setCoords(self, x1, y1, x2, y2, reproject = False):
 		"""Set coordinates of window to run from (x1,y1) in the
-		lower-left corner to (x2,y2) in the upper-right corner."""
+		lower-left corner to (x2,y2) in the upper-right corner.
+		With reproject = True, the objects already drawn are moved to their
+		places in the new coordinates (with one coords command each)"""
 		self.center = Point(x2 - x1, y2 - y1)
 		self.xMin, self.yMin, self.xMax, self.yMax = x1, y1, x2, y2
-		self.trans = Transform(self.width, self.height, x1, y1, x2, y2)
+		old, self.trans = self.trans, Transform(self.width, self.height, x1, y1, x2, y2)
+		for viewer in list(self._viewers):
+			viewer._viewChanged()
+		if self._culling is not None:
+			self._layOut()
+		elif reproject:
+			self._reproject(self.trans.mapFrom(old))
 		
 	def clear(self, *items):
-		self.delete(tkinter.ALL)
-		items = list(items) + list(self.all_objects.values())
-		undrawAll(*items)
-		self.update()
+		'''Deletes everything in the window with a single canvas command and flush, and undraws
+		the drawn objects along with items (which may be drawn in other windows)'''
+		if self._frame is not None:
+			# the items stay on screen until the frame is swapped in
+			self.delete(_FRAME_TAG)
+			self.addtag_withtag(_STALE_TAG, tkinter.ALL)
+			if self._pixelLayer:
+				self._frame.append(self._pixelLayer)
+				self._pixelLayer = None
+		else:
+			self.delete(tkinter.ALL)
+		drawn = self._drawn()
+		# the bookkeeping is reset wholesale, so that detaching each object touches neither
+		#   the canvas nor the mirror
+		self.all_objects = {}
+		self._pending.clear()
+		self._index = None
+		if self._culling is not None:
+			self._culling.clear()
+		if self._recording is not None:
+			self._recording.clear()
+		if self._pixelLayer:
+			self._pixelLayer.reset()
 		if self.save_image:
-			self.image = PILImage.new('RGBA', (self.width, self.height))
-			self.drawing_image = ImageDraw.Draw(self.image)
+			self._mirror.clear()
+		for item in drawn:
+			item._detach()
+		undrawAll(*items)
+		if not self._batchDepth and not self.closed:
+			self._update()
 
 	def close(self):
 		"""Close the window"""
 		if self.closed:
 			return
 		self.closed = True
+		if self._mirror:
+			self._mirror.stop()
+		self._stopQueue()
 		self.master.destroy()
-		self.__autoflush()
+		self._autoflush()
 
 	def isClosed(self):
 		return self.closed
@@ -316,66 +515,418 @@ class GraphWin(tkinter.Canvas):
 	def isOpen(self):
 		return not self.closed
 
-	def __autoflush(self):
+	def setCulling(self, on = True):
+		'''Sets whether drawn shapes (Points, Rectangles, Ovals, Lines, Polygons, Polylines and PointClouds)
+		that lie entirely outside the window's coordinates are left off the canvas. They stay drawn: they can be
+		moved, reconfigured and undrawn, are found by objectsAt and get a canvas item once they come into view.
+		With culling on, setCoords draws every object in the new coordinates, rather than only those drawn later'''
+		self.__checkOpen()
+		if on and self._culling is None:
+			self._culling = collections.OrderedDict()
+			with self.batch():
+				for item in list(self.all_objects.values()):
+					if item._cullMode:
+						self._culling[item] = None
+						if item._cullMode == "cull" and not self._inView(item):
+							self._cull(item)
+				for item in list(self._pending):
+					self._culling[item] = _groupTags(item)
+				self._pending.clear()
+		elif not on and self._culling is not None:
+			with self.batch():
+				for item, tags in list(self._culling.items()):
+					if tags is not None:
+						self._materialize(item)
+						if item.id is None:
+							self._pending[item] = None
+			self._culling = None
+
+	def isCulling(self):
+		return self._culling is not None
+
+	def _drawn(self):
+		'''Internal: every drawn object, including those culling left off the canvas'''
+		items = list(self.all_objects.values())
+		items.extend(self._pending)
+		if self._culling is not None:
+			items.extend(item for item, tags in self._culling.items() if tags is not None)
+		return items
+
+	def _inView(self, item):
+		'''Internal: whether the bounding box of an object, widened by a few pixels for line widths and
+		markers, meets the window's coordinates. Objects without known bounds are always in view'''
+		box = item._bounds()
+		if box is None:
+			return True
+		if self.trans:
+			x1, x2 = min(self.xMin, self.xMax), max(self.xMin, self.xMax)
+			y1, y2 = min(self.yMin, self.yMax), max(self.yMin, self.yMax)
+			marginX, marginY = _CULL_MARGIN * abs(self.trans.xscale), _CULL_MARGIN * abs(self.trans.yscale)
+		else:
+			x1, y1, x2, y2 = 0, 0, self.width, self.height
+			marginX = marginY = _CULL_MARGIN
+		return box[0] <= x2 + marginX and box[2] >= x1 - marginX and box[1] <= y2 + marginY and box[3] >= y1 - marginY
+
+	def _cull(self, item):
+		'''Internal: deletes the canvas item of a drawn object, keeping its group tags for when it is drawn again'''
+		tags = tuple(tag for tag in self.gettags(item.id) if tag not in (tkinter.CURRENT, _FRAME_TAG))
+		self.delete(item.id)
+		if self.save_image:
+			self._mirror.undraw(item.id)
+		del self.all_objects[item.id]
+		item._itemDeleted()
+		item.id = None
+		self._culling[item] = tags
+
+	def _materialize(self, item):
+		'''Internal: draws the canvas item of an object that culling left off the canvas'''
+		item.id = item._draw(self, item.config)
+		if item.id is None:
+			return # nothing to show yet (an empty Polyline)
+		self.all_objects[item.id] = item
+		self._stackTop += 1
+		item._stack = self._stackTop
+		for tag in self._culling[item]:
+			self.addtag_withtag(tag, item.id)
+		self._culling[item] = None
+
+	def _adopt(self, item):
+		'''Internal: registers the new canvas item of a drawn object and tags it for the groups it belongs to'''
+		self.all_objects[item.id] = item
+		self._pending.pop(item, None)
+		self._stackTop += 1
+		item._stack = self._stackTop
+		for tag in _groupTags(item):
+			self.addtag_withtag(tag, item.id)
+
+	def _checkView(self, item):
+		'''Internal: with culling on, draws a culled object that came into view or culls one that left it'''
+		if item._cullMode != "cull":
+			return
+		if self._inView(item):
+			if item.id is None:
+				self._materialize(item)
+		elif item.id is not None:
+			self._cull(item)
+
+	def _reproject(self, affine):
+		'''Internal: moves the canvas items of the drawn objects to their places in the window's coordinates,
+		with a single flush; affine maps the old screen coordinates to the new ones'''
+		with self.batch():
+			for item in list(self.all_objects.values()):
+				item._reproject(self, affine)
+
+	def _layOut(self):
+		'''Internal: with culling on, draws the objects again in the window's coordinates, leaving those out of view
+		off the canvas. Objects are drawn in their drawing order, so that the stacking order is kept'''
+		with self.batch():
+			for item, tags in list(self._culling.items()):
+				if tags is None:
+					self._cull(item)
+				if item._cullMode != "cull" or self._inView(item):
+					self._materialize(item)
+
+	def _autoflush(self):
+		if self.autoflush and not self._batchDepth:
+			self._update()
+
+	def _update(self):
+		'''Internal: brings the window up to date with the drawing'''
 		global _root
-		if self.autoflush:
-			try:
-				_root.update()
-			except tkinter.TclError:
-				pass
+		try:
+			_root.update()
+		except tkinter.TclError:
+			pass
+
+	def begin(self):
+		'''Starts a batch: drawing, moving and reconfiguring objects no longer flushes the window until commit is called.
+		Batches may be nested; only the outermost commit flushes'''
+		if not self._batchDepth and self._doubleBuffer:
+			self._frame = []
+		self._batchDepth += 1
+
+	def commit(self):
+		'''Ends the batch started by begin and flushes the window once, regardless of autoflush'''
+		self._endBatch(True)
+
+	def _endBatch(self, flush):
+		'''Internal: ends a batch; the outermost one shows a double-buffered frame and flushes the window if flush is true'''
+		if not self._batchDepth:
+			raise GraphicsError("commit without a matching begin")
+		self._batchDepth -= 1
+		if not self._batchDepth:
+			if self._frame is not None:
+				self._swap()
+			if flush and not self.closed:
+				self._update()
+
+	@contextlib.contextmanager
+	def _bulk(self):
+		'''Internal: a batch for an operation on many objects (drawAll, GraphicsGroup), which flushes once at the
+		end only if the window autoflushes, as each single operation would'''
+		self.begin()
+		try:
+			yield self
+		finally:
+			self._endBatch(self.autoflush)
+
+	def setDoubleBuffer(self, on = True):
+		'''Sets whether batches (begin and commit, batch, drawAll, animation frames) are double-buffered: the items
+		drawn in the batch are hidden until it is committed, and clear leaves the old items on screen until then.
+		The window then shows each batch whole, even if it is updated while the batch is built'''
+		self._doubleBuffer = on
+
+	def isDoubleBuffered(self):
+		return self._doubleBuffer
+
+	@contextlib.contextmanager
+	def buffered(self):
+		'''Like batch, but double-buffered whether or not setDoubleBuffer is on:
+			with win.buffered():
+				win.clear()
+				drawAll(win, *scene)'''
+		previous, self._doubleBuffer = self._doubleBuffer, True
+		try:
+			self.begin()
+		finally:
+			self._doubleBuffer = previous
+		try:
+			yield self
+		finally:
+			self.commit()
+
+	def _swap(self):
+		'''Internal: shows the frame built by a double-buffered batch in place of the items it replaces'''
+		self._frame = None
+		if self.closed:
+			return
+		self.delete(_STALE_TAG)
+		self.itemconfig(_FRAME_TAG, state = tkinter.NORMAL)
+		self.dtag(_FRAME_TAG)
+
+	def _create(self, itemType, args, kw):
+		# the items of a double-buffered frame are created hidden
+		if self._frame is not None:
+			tags = kw.get("tags", ())
+			tags = (tags,) if isinstance(tags, str) else tuple(tags)
+			kw = dict(kw, state = tkinter.HIDDEN, tags = tags + (_FRAME_TAG,))
+		return tkinter.Canvas._create(self, itemType, args, kw)
+
+	@contextlib.contextmanager
+	def batch(self):
+		'''Context manager around begin and commit:
+			with win.batch():
+				for item in items: item.draw(win)'''
+		self.begin()
+		try:
+			yield self
+		finally:
+			self.commit()
+
+	def animate(self, step, fps = 60, frames = None):
+		'''Calls step(dt) fps times a second from the Tk event loop, where dt is the time (in seconds) since the
+		previous frame, and returns the running Animation. Everything step draws, moves or reconfigures is
+		flushed once per frame. The animation stops after frames frames (if given), when step returns False,
+		when Animation.stop is called or when the window is closed:
+			def step(dt):
+				ball.move(speed * dt, 0)
+			win.animate(step).wait()'''
+		self.__checkOpen()
+		return Animation(self, step, fps, frames).start()
 	
 	def plot(self, x, y, color="black"):
 		"""Set pixel (x,y) to the given color"""
 		self.__checkOpen()
 		xs,ys = self.toScreen(x,y)
-		self.create_line(xs,ys,xs+1,ys+1, fill=color)
-		self.__autoflush()
+		if self.raster:
+			self._pixels().put(xs, ys, color)
+		else:
+			self.create_line(xs,ys,xs+1,ys+1, fill=color)
+		self._autoflush()
 		if self.save_image:
-			self.drawing_image.point((xs, ys), color)
+			self._mirror.draw(None, 'point', (xs, ys), color)
+		if self._recording is not None:
+			self._recording.add("plot", (x, y), {"fill": color})
 		
 	def plotPixel(self, x, y, color="black"):
 		"""Set pixel raw (independent of window coordinates) pixel
 		(x,y) to color"""
 		self.__checkOpen()
-		self.create_line(x,y,x+1,y+1, fill=color)
-		self.__autoflush()
+		if self.raster:
+			self._pixels().put(x, y, color)
+		else:
+			self.create_line(x,y,x+1,y+1, fill=color)
+		self._autoflush()
 		if self.save_image:
-			self.drawing_image.point((x, y), color)
+			self._mirror.draw(None, 'point', (x, y), color)
+		if self._recording is not None:
+			self._recording.add("pixels", (x, y), {"fill": color})
 	
+	def plotMany(self, xs, ys, colors = "black"):
+		'''Sets the pixels (xs[i], ys[i]) to colors[i] in one operation; colors may also be a single color for every pixel.
+		xs and ys may be sequences or NumPy arrays. The pixels always go into the window's pixel layer'''
+		self.__checkOpen()
+		if self._recording is not None:
+			self._recordPixels("plot", xs, ys, colors)
+		if self.trans:
+			xs, ys = self.trans.screenMany(xs, ys)
+		self._plotMany(xs, ys, colors)
+
+	def plotPixels(self, xs, ys, colors = "black"):
+		'''Same as plotMany, but with raw (independent of window coordinates) pixel coordinates'''
+		self.__checkOpen()
+		if self._recording is not None:
+			self._recordPixels("pixels", xs, ys, colors)
+		self._plotMany(xs, ys, colors)
+
+	def _recordPixels(self, kind, xs, ys, colors):
+		if isinstance(colors, str):
+			self._recording.add(kind, _interleave(xs, ys), {"fill": colors})
+		else:
+			for x, y, color in zip(xs, ys, colors):
+				self._recording.add(kind, (x, y), {"fill": color})
+
+	def _plotMany(self, xs, ys, colors):
+		self._pixels().putMany(xs, ys, colors)
+		if self.save_image:
+			if HAS_NUMPY:
+				xs, ys = numpy.asarray(xs, dtype=int).tolist(), numpy.asarray(ys, dtype=int).tolist()
+			if isinstance(colors, str):
+				self._mirror.draw(None, 'point', list(zip(xs, ys)), colors)
+			else:
+				groups = {}
+				for x, y, color in zip(xs, ys, colors):
+					groups.setdefault(color, []).append((int(x), int(y)))
+				for color, points in groups.items():
+					self._mirror.draw(None, 'point', points, color)
+		self._autoflush()
+
+	def record(self, on = True):
+		'''Starts (or, with on = False, stops) recording the drawing into a DisplayList.
+		While recording, the display list follows undraw, move, reconfiguration and clear'''
+		self._recording = DisplayList() if on else None
+
+	def isRecording(self):
+		return self._recording is not None
+
+	def displayList(self):
+		'''Returns a copy of the recorded drawing'''
+		if self._recording is None:
+			raise GraphicsError("window is not recording")
+		return self._recording.copy()
+
+	def replay(self, displayList):
+		'''Draws the commands of displayList in the window's current coordinates'''
+		self.__checkOpen()
+		displayList.replay(self)
+
+	def _redraw(self):
+		'''Internal: clears a recording window and draws the recording again in its current coordinates, with a
+		single flush. Recorded objects are drawn again themselves, so they are still tracked (by objectsAt, culling
+		and setCoords), and only the other commands are replayed'''
+		entries = list(self._recording.entries.items())
+		drawn = self._drawn()
+		with self.batch():
+			self.clear()
+			for key, (kind, coords, config) in entries:
+				if isinstance(key, GraphicsObject):
+					key.draw(self)
+				else:
+					_replayCommand(self, kind, coords, config)
+			for item in drawn:
+				if not item.canvas:
+					item.draw(self) # not recorded, such as Images and Entries
+
+	def setRaster(self, raster = True):
+		'''Sets whether plot and plotPixel write into the window's pixel layer (a single image) rather than
+		creating a canvas item for every pixel'''
+		self.raster = raster
+
+	def _pixels(self):
+		'''Internal: returns the pixel layer, creating it on first use'''
+		if not self._pixelLayer:
+			self._pixelLayer = _PixelLayer(self)
+		return self._pixelLayer
+
+	def _rgbaImage(self, width, height, buffer):
+		'''Internal: returns an image of the RGBA pixels in buffer, for create_image'''
+		image = tkinter.PhotoImage(master=self, width=width, height=height)
+		stride = width * 4
+		rows = [buffer[y * stride:(y + 1) * stride] for y in range(height)]
+		image.tk.call(image.name, 'put', _encodePNG(width, height, rows), '-format', 'png')
+		return image
+
 	def flush(self):
 		"""Update drawing to the window"""
 		self.__checkOpen()
+		if self._pixelLayer:
+			self._pixelLayer.push()
 		self.update_idletasks()
 		
-	def getMouse(self):
+	def getMouse(self, timeout = None):
 		"""Wait for mouse click and return Point object representing
-		the click"""
-		self.update()      # flush any prior clicks
-		self.mouseX = None
-		self.mouseY = None
-		while self.mouseX == None or self.mouseY == None:
-			self.update()
-			if self.isClosed():
-				raise GraphicsError("getMouse in closed window")
-			time.sleep(.1) # give up thread
-		x,y = self.toWorld(self.mouseX, self.mouseY)
-		self.mouseX = None
-		self.mouseY = None
+		the click. Clicks are queued, so a click made before the call
+		is returned right away. If timeout (in seconds) passes without
+		a click, returns None"""
+		self.update()      # queues any pending clicks
+		if not self._wait(self._clickQueue, timeout, "getMouse in closed window"):
+			return None
+		x,y = self.toWorld(*self._clickQueue.popleft())
 		return Point(x,y)
 
 	def checkMouse(self):
-		"""Return last mouse click or None if mouse has
-		not been clicked since last call"""
+		"""Return the oldest unread mouse click or None if mouse has
+		not been clicked since last call. Like update, it handles the
+		pending events, timers and redraws, so a polling loop keeps the
+		window current even with autoflush off"""
 		if self.isClosed():
 			raise GraphicsError("checkMouse in closed window")
-		self.update()
-		if self.mouseX != None and self.mouseY != None:
-			x,y = self.toWorld(self.mouseX, self.mouseY)
-			self.mouseX = None
-			self.mouseY = None
+		self._pumpEvents()
+		if self._clickQueue:
+			x,y = self.toWorld(*self._clickQueue.popleft())
 			return Point(x,y)
 		else:
 			return None
+
+	def getKey(self, timeout = None):
+		"""Wait for a key press and return its keysym (e.g. "a", "Up" or "Return").
+		If timeout (in seconds) passes without a key press, returns None"""
+		self.update()
+		if not self._wait(self._keyQueue, timeout, "getKey in closed window"):
+			return None
+		return self._keyQueue.popleft()
+
+	def checkKey(self):
+		"""Return the keysym of the oldest unread key press, or "" if no
+		key has been pressed since last call"""
+		if self.isClosed():
+			raise GraphicsError("checkKey in closed window")
+		self._pumpEvents()
+		if self._keyQueue:
+			return self._keyQueue.popleft()
+		return ""
+
+	def _wait(self, events, timeout, message):
+		'''Internal: runs the event loop until events (a click or key queue) is not empty; returns False
+		if timeout (in seconds) passed first'''
+		expired = []
+		timer = None
+		if timeout is not None:
+			def expire():
+				expired.append(True)
+				self._wakeMouse()
+			timer = self.after(int(timeout * 1000), expire)
+		try:
+			while not events:
+				if self.isClosed():
+					raise GraphicsError(message)
+				if expired:
+					return False
+				self.wait_variable(self._clicks) # runs the event loop until a click, key press (or wake-up)
+		finally:
+			if timer and not expired and not self.isClosed():
+				self.after_cancel(timer)
+		return True
 			
 	def getHeight(self):
 		"""Return the height of the window"""
@@ -385,32 +936,41 @@ class GraphWin(tkinter.Canvas):
 		"""Return the width of the window"""
 		return self.width
 
+	@property
+	def image(self):
+		'''The PIL image mirroring the window (save_image = True), once every pending drawing command has been applied'''
+		if self._mirror:
+			return self._mirror.wait()
+
 	def save(self, filepath = "graphwin.jpg"):
 		'''Saves the drawn image under the given filepath'''
 		if HAS_PIL and self.save_image:	
-			self.image.save(filepath)
+			self._mirror.wait().save(filepath)
 	
 	def saveImage(self, filepath = "graphwin.jpg"):
 		'''Deprecated (but maintained for backwards compatability), please use GraphWin.save'''
 		self.save(filepath)
 	
 	def translate(self, x, y, mode = LOCAL):
-		'''Translates the (x, y) pixel coordinate to the custom coordinates'''
+		'''Translates the (x, y) pixel coordinate to the custom coordinates
+		x and y may also be sequences (or NumPy arrays) of coordinates'''
 		if mode == GLOBAL:
-			x -= self.winfo_rootx()
-			y -= self.winfo_rooty()
+			x = _offset(x, -self.winfo_rootx())
+			y = _offset(y, -self.winfo_rooty())
 		return self.toWorld(x, y)
 	
 	def translateCustom(self, x, y, mode = LOCAL):
-		'''Translates custom coordinates to pixel coordinates'''
+		'''Translates custom coordinates to pixel coordinates
+		x and y may also be sequences (or NumPy arrays) of coordinates'''
 		x, y = self.toScreen(x, y)
 		if mode == GLOBAL:
-			x += self.winfo_rootx()
-			y += self.winfo_rooty()
+			x = _offset(x, self.winfo_rootx())
+			y = _offset(y, self.winfo_rooty())
 		return (x, y)
 	
 	def toScreen(self, x, y):
-		'''Returns pixel coordinates'''
+		'''Returns pixel coordinates
+		Sequences of coordinates are converted in one step and returned as arrays'''
 		trans = self.trans
 		if trans:
 			return self.trans.screen(x,y)
@@ -418,22 +978,1160 @@ class GraphWin(tkinter.Canvas):
 			return x,y
 					
 	def toWorld(self, x, y):
-		'''Returns custom coordinates'''
+		'''Returns custom coordinates
+		Sequences of coordinates are converted in one step and returned as arrays'''
 		trans = self.trans
 		if trans:
 			return self.trans.world(x,y)
 		else:
 			return x,y
 		
+	def objectsAt(self, point):
+		'''Returns the drawn objects whose bounding boxes contain the point (in window coordinates), topmost first'''
+		return self._topmostFirst(self._spatialIndex().query(point.x, point.y, point.x, point.y))
+
+	def objectsIn(self, p1, p2 = None):
+		'''Returns the drawn objects whose bounding boxes intersect the rectangle with corners p1 and p2
+		(in window coordinates), topmost first. A Rectangle may be given in place of the two corners'''
+		if p2 is None:
+			p1, p2 = p1.p1, p1.p2
+		return self._topmostFirst(self._spatialIndex().query(min(p1.x, p2.x), min(p1.y, p2.y), max(p1.x, p2.x), max(p1.y, p2.y)))
+
+	def _topmostFirst(self, items):
+		'''Internal: sorts drawn objects by the canvas stacking order, topmost first; objects
+		without a canvas item (left off by culling) come last'''
+		if len(items) > 1:
+			if self._stackDirty:
+				self._readStacking()
+			items.sort(key=lambda item: (item.id is not None, item._stack), reverse=True)
+		return items
+
+	def _readStacking(self):
+		'''Internal: numbers the drawn objects by their places in the canvas stacking order. Objects whose
+		id is a tag (TiledImage) are as high as their topmost item'''
+		self._stackDirty = False
+		self._stackBottom = 0
+		for self._stackTop, key in enumerate(self.find_all(), 1):
+			item = self._stackObject(key)
+			if item is not None:
+				item._stack = self._stackTop
+
+	def _stackObject(self, key):
+		'''Internal: the drawn object a canvas item belongs to, or None'''
+		item = self.all_objects.get(key)
+		if item is None:
+			# the items of a TiledImage carry its id as a tag
+			for tag in self.gettags(key):
+				item = self.all_objects.get(tag)
+				if item is not None:
+					break
+		return item
+
+	def _restacked(self, tagOrId, reference, top):
+		'''Internal: keeps the stacking numbers of the drawn objects in step with tag_raise and tag_lower.
+		Raising or lowering to the top or bottom renumbers only the objects moved; a move relative to
+		another item has the whole order read again when it is next needed'''
+		item = self.all_objects.get(tagOrId)
+		if item is not None:
+			items = [item]
+		else:
+			items = []
+			for key in self.find_withtag(tagOrId):
+				item = self._stackObject(key)
+				if item is not None and item not in items:
+					items.append(item)
+		if not items:
+			return
+		if reference is not None:
+			references = set(self._stackObject(key) for key in self.find_withtag(reference))
+			if references != set(items):
+				# (the tiles of a TiledImage are restacked among themselves, which moves no object)
+				self._stackDirty = True
+		elif top:
+			for item in items:
+				self._stackTop += 1
+				item._stack = self._stackTop
+		else:
+			for item in reversed(items):
+				self._stackBottom -= 1
+				item._stack = self._stackBottom
+
+	def tag_raise(self, tagOrId, aboveThis = None):
+		self._restacked(tagOrId, aboveThis, True)
+		tkinter.Canvas.tag_raise(self, tagOrId, *(() if aboveThis is None else (aboveThis,)))
+	lift = tkraise = tag_raise
+
+	def tag_lower(self, tagOrId, belowThis = None):
+		self._restacked(tagOrId, belowThis, False)
+		tkinter.Canvas.tag_lower(self, tagOrId, *(() if belowThis is None else (belowThis,)))
+	lower = tag_lower
+
+	def _spatialIndex(self):
+		'''Internal: returns the spatial index, building it on first use. From then on, it is kept up
+		to date by draw, undraw and move'''
+		if self._index is None:
+			if self.trans:
+				xsize, ysize = self.trans.xscale * self.width / 16.0, self.trans.yscale * self.height / 16.0
+			else:
+				xsize, ysize = self.width / 16.0, self.height / 16.0
+			self._index = _SpatialIndex(xsize, ysize)
+			for item in self._drawn():
+				self._index.insert(item)
+		return self._index
+
+	def post(self, function, *args, **kwargs):
+		'''Queues function(*args, **kwargs) to run on the thread that runs Tk, and returns at once. Safe to call
+		from any thread (on the Tk thread itself, the function runs right away), so worker threads can draw:
+			win.post(circle.draw, win)
+		The commands run in the order they were posted, from the window's event loop (getMouse, update,
+		mainloop, ...). When the queue is full, post waits for room, so fast producers are held back'''
+		if threading.current_thread() is self._thread:
+			return function(*args, **kwargs)
+		command = (function, args, kwargs)
+		while True:
+			if self.closed:
+				raise GraphicsError("window is closed")
+			try:
+				self._commands.put(command, timeout = 0.1)
+				break
+			except queue.Full:
+				pass
+		self._wakeQueue()
+
+	def submit(self, function, *args, **kwargs):
+		'''Like post, but returns a concurrent.futures.Future of the function's result'''
+		if Future is None:
+			raise GraphicsError("concurrent.futures is not available")
+		future = Future()
+		def run():
+			if future.set_running_or_notify_cancel():
+				try:
+					future.set_result(function(*args, **kwargs))
+				except Exception as error:
+					future.set_exception(error)
+		self.post(run)
+		return future
+
+	def runQueue(self, limit = _QUEUE_BATCH):
+		'''Runs up to limit of the commands queued by post and submit, in one batch (so with a single flush);
+		returns how many ran. Windows run their queue from the event loop; an OffscreenWin, which has none,
+		must call this itself'''
+		ran = 0
+		with self.batch():
+			while ran < limit:
+				try:
+					function, args, kwargs = self._commands.get_nowait()
+				except queue.Empty:
+					break
+				ran += 1
+				try:
+					function(*args, **kwargs)
+				except Exception:
+					sys.excepthook(*sys.exc_info()) # reported, like an error in a Tk callback
+		return ran
+
+	def _listenQueue(self):
+		'''Internal: arranges for the event loop to run the commands queued by post. Where Tk can watch a pipe,
+		post writes to it to wake the loop, so an idle queue costs nothing; elsewhere a timer checks the queue'''
+		if hasattr(self.tk, "createfilehandler"):
+			self._wakeFds = os.pipe()
+			self.tk.createfilehandler(self._wakeFds[0], tkinter.READABLE, self._onQueueWake)
+		else:
+			self._queueTimer = self.after(_QUEUE_INTERVAL, self._runQueue)
+
+	def _wakeQueue(self):
+		'''Internal: wakes the event loop to run the queue; called by post once its command is queued'''
+		fds = self._wakeFds
+		if fds and not self._woken:
+			self._woken = True
+			try:
+				os.write(fds[1], b"!")
+			except OSError:
+				pass # closed meanwhile
+
+	def _onQueueWake(self, fd, mask):
+		# the pipe is drained before the flag is cleared, so a post that finds the
+		#   flag set has queued its command before the queue is run below
+		os.read(fd, 64)
+		self._woken = False
+		if self._queueTimer is None:
+			self._runQueue()
+
+	def _runQueue(self):
+		'''Internal: runs posted commands from the event loop; it comes back at once while more than a batch
+		is waiting, and without a wake-up pipe it checks the queue again every _QUEUE_INTERVAL milliseconds'''
+		self._queueTimer = None
+		if self.closed:
+			return
+		ran = self.runQueue() if not self._commands.empty() else 0
+		if ran == _QUEUE_BATCH:
+			delay = 1
+		elif self._wakeFds is None:
+			delay = _QUEUE_INTERVAL
+		else:
+			return
+		try:
+			self._queueTimer = self.after(delay, self._runQueue)
+		except tkinter.TclError:
+			pass
+
+	def _stopQueue(self):
+		'''Internal: stops running the queue once the window closes'''
+		if self._queueTimer is not None:
+			try:
+				self.after_cancel(self._queueTimer)
+			except tkinter.TclError:
+				pass
+			self._queueTimer = None
+		fds, self._wakeFds = self._wakeFds, None
+		if fds:
+			try:
+				self.tk.deletefilehandler(fds[0])
+			except tkinter.TclError:
+				pass
+			for fd in fds:
+				os.close(fd)
+
 	def setMouseHandler(self, func):
 		self._mouseCallback = func
+
+	def setMotionHandler(self, func):
+		'''Calls func(point), with point in window coordinates, as the mouse moves over the window. Motion is
+		coalesced: func is called at most once a frame, with the latest position. None removes the handler'''
+		self._setMotion("<Motion>", func)
+
+	def setDragHandler(self, func):
+		'''Like setMotionHandler, but for motion with the left mouse button held down'''
+		self._setMotion("<B1-Motion>", func)
+
+	def _setMotion(self, sequence, func):
+		binding = self._motionBindings.pop(sequence, None)
+		if binding:
+			# unbind(sequence, funcid) drops every binding for the sequence (before Python 3.13),
+			#   so only this handler's line is taken out of the binding script
+			script = "\n".join(line for line in self.bind(sequence).split("\n") if '"[%s ' % binding not in line)
+			self.bind(sequence, script if script.strip() else "")
+			self.deletecommand(binding)
+		self._motionHandlers.pop(sequence, None)
+		if func:
+			self._motionHandlers[sequence] = func
+			self._motionBindings[sequence] = self.bind(sequence, lambda e: self._onMotion(sequence, e), "+")
+
+	def mouse(self):
+		'''Returns an asyncio future for the Point (in window coordinates) of the next click:
+			point = await win.mouse()'''
+		return self._future(self._mouseWaiters)
+
+	def key(self):
+		'''Returns an asyncio future for the keysym of the next key press:
+			key = await win.key()'''
+		return self._future(self._keyWaiters)
+
+	def frame(self):
+		'''Returns an asyncio future that is resolved once the pending drawing has been displayed:
+			await win.frame()'''
+		future = self._future([])
+		self.after_idle(_resolve, [future], None)
+		return future
+
+	def _future(self, waiters):
+		if asyncio is None:
+			raise GraphicsError("asyncio is not available")
+		self.__checkOpen()
+		future = asyncio.get_event_loop().create_future()
+		waiters.append(future)
+		return future
 		
 	def _onClick(self, e):
 		self.mouseX = e.x
 		self.mouseY = e.y
+		# a click that an awaited mouse() takes is not queued for getMouse as well
+		if not (self._mouseWaiters and _resolve(self._mouseWaiters, Point(*self.toWorld(e.x, e.y)))):
+			self._clickQueue.append((e.x, e.y))
+		self._wakeMouse()
 		if self._mouseCallback:
 			self._mouseCallback(Point(e.x, e.y)) 
-					
+
+	def _onKey(self, e):
+		self.lastKey = e.keysym
+		if not (self._keyWaiters and _resolve(self._keyWaiters, e.keysym)):
+			self._keyQueue.append(e.keysym)
+		self._wakeMouse()
+
+	def _onMotion(self, sequence, e):
+		# only the latest position is kept; the first event of a frame schedules its delivery
+		if sequence not in self._motionPending:
+			self.after(_FRAME_MS, self._deliverMotion, sequence)
+		self._motionPending[sequence] = (e.x, e.y)
+
+	def _deliverMotion(self, sequence):
+		position = self._motionPending.pop(sequence, None)
+		func = self._motionHandlers.get(sequence)
+		if position and func and not self.closed:
+			func(Point(*self.toWorld(*position)))
+
+	def _onDestroy(self, e):
+		if e.widget is self:
+			self.closed = True
+			self._stopQueue()
+			self._wakeMouse()
+			error = GraphicsError("window is closed")
+			for waiters in (self._mouseWaiters, self._keyWaiters):
+				for future in waiters:
+					if not future.done():
+						future.set_exception(error)
+				del waiters[:]
+
+	def _wakeMouse(self):
+		'''Internal: releases a getMouse or getKey that is waiting on the click variable'''
+		try:
+			self._clicks.set(self._clicks.get() + 1)
+		except tkinter.TclError:
+			pass
+
+	def _pumpEvents(self, flags = tkinter._tkinter.ALL_EVENTS):
+		'''Internal: handles the pending events of the given kinds (by default window events, timers
+		and idle tasks such as redraws, as update does) without waiting for new ones; returns the
+		number of events handled'''
+		handled = 0
+		try:
+			while self.tk.dooneevent(flags | tkinter._tkinter.DONT_WAIT):
+				handled += 1
+		except tkinter.TclError:
+			pass
+		return handled
+
+class Animation(object):
+
+	"""A step function called at a steady frame rate from the Tk event loop (see GraphWin.animate),
+	with statistics of the frames it ran"""
+	# Frames are due on a fixed timeline (one every 1 / fps seconds from the start)
+	#   and a single after call is pending at a time. When a frame overruns, the
+	#   frames it ran into are dropped rather than run back to back, so the
+	#   animation keeps its pace at a lower frame rate. Frame times (the step and
+	#   its flush) are kept for the last KEEP frames.
+
+	KEEP = 1000
+
+	def __init__(self, window, step, fps = 60, frames = None):
+		if fps <= 0:
+			raise GraphicsError(BAD_OPTION)
+		self.window = window
+		self.step = step
+		self.fps = fps
+		self.frames = frames
+		self.count = 0
+		self.dropped = 0
+		self.times = collections.deque(maxlen = self.KEEP)
+		self.running = False
+		self._timer = None
+		self._started = self._due = self._last = None
+
+	def start(self):
+		'''Starts (or restarts) the animation; returns it'''
+		if not self.running:
+			self.running = True
+			self._started = self._due = self._last = _clock()
+			self._timer = self.window.after(0, self._tick)
+		return self
+
+	def stop(self):
+		'''Stops the animation after the current frame'''
+		if not self.running:
+			return
+		self.running = False
+		if self._timer:
+			try:
+				self.window.after_cancel(self._timer)
+			except tkinter.TclError:
+				pass
+			self._timer = None
+		self.window._wakeMouse() # releases wait
+
+	def isRunning(self):
+		return self.running
+
+	def wait(self):
+		'''Runs the event loop until the animation stops'''
+		while self.running and not self.window.isClosed():
+			self.window.wait_variable(self.window._clicks)
+
+	def _tick(self):
+		self._timer = None
+		if not self.running:
+			return
+		if self.window.isClosed():
+			self.stop()
+			return
+		began = _clock()
+		dt, self._last = began - self._last, began
+		try:
+			with self.window.batch():
+				result = self.step(dt)
+		except Exception:
+			self.stop()
+			raise
+		self.count += 1
+		ended = _clock()
+		self.times.append(ended - began)
+		if result is False or (self.frames is not None and self.count >= self.frames):
+			self.stop()
+			return
+		interval = 1.0 / self.fps
+		self._due += interval
+		if ended > self._due:
+			missed = int((ended - self._due) / interval) + 1
+			self.dropped += missed
+			self._due += missed * interval
+		self._timer = self.window.after(int((self._due - ended) * 1000), self._tick)
+
+	def getFPS(self):
+		'''Returns the achieved frame rate'''
+		elapsed = (self._last or 0) - (self._started or 0)
+		return (self.count - 1) / elapsed if self.count > 1 and elapsed > 0 else 0.0
+
+	def percentile(self, p):
+		'''Returns the frame time (in seconds) that p percent of the recent frames took at most'''
+		if not self.times:
+			return 0.0
+		times = sorted(self.times)
+		return times[min(len(times) - 1, int(len(times) * p / 100.0))]
+
+	def stats(self):
+		"""Returns a dictionary of the frame counts, the achieved frame rate and the median, 90th and
+		99th percentile frame times (in milliseconds)"""
+		return {"frames": self.count, "dropped": self.dropped, "fps": self.getFPS(),
+			"p50": self.percentile(50) * 1000, "p90": self.percentile(90) * 1000, "p99": self.percentile(99) * 1000}
+
+class _PixelLayer:
+
+	"""Internal class for a window-sized PhotoImage that holds plotted pixels"""
+	# The pixels live in an RGBA buffer; the rows touched since the last push are
+	#   written to the PhotoImage with a single put (as PNG data, which keeps the
+	#   unplotted pixels transparent) when the event loop next goes idle, or on
+	#   GraphWin.flush. The canvas only ever holds one image item for all of them.
+
+	def __init__(self, canvas):
+		self.canvas = canvas
+		self.width, self.height = int(canvas.width), int(canvas.height)
+		self.image = tkinter.PhotoImage(master=canvas, width=self.width, height=self.height)
+		self.buffer = bytearray(self.width * self.height * 4)
+		self.colors = {}
+		self.id = None
+		self.dirty = None
+		self.scheduled = False
+
+	def rgba(self, color):
+		value = self.colors.get(color)
+		if value is None:
+			r, g, b = self.canvas.winfo_rgb(color)
+			value = self.colors[color] = bytes(bytearray((r >> 8, g >> 8, b >> 8, 255)))
+		return value
+
+	def put(self, x, y, color):
+		x, y = int(x), int(y)
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return
+		i = (y * self.width + x) * 4
+		self.buffer[i:i+4] = self.rgba(color)
+		self._touch(y, y)
+
+	def putMany(self, xs, ys, colors):
+		single = isinstance(colors, str)
+		if HAS_NUMPY:
+			xs = numpy.asarray(xs, dtype=int)
+			ys = numpy.asarray(ys, dtype=int)
+			inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+			xs, ys = xs[inside], ys[inside]
+			if not len(xs):
+				return
+			pixels = numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(self.height, self.width, 4)
+			if single:
+				values = numpy.frombuffer(self.rgba(colors), dtype=numpy.uint8)
+			else:
+				rgba = self.rgba
+				values = numpy.frombuffer(b''.join([rgba(c) for c in colors]), dtype=numpy.uint8).reshape(-1, 4)[inside]
+			pixels[ys, xs] = values
+			self._touch(int(ys.min()), int(ys.max()))
+		else:
+			if single:
+				colors = [colors] * len(xs)
+			for x, y, color in zip(xs, ys, colors):
+				self.put(x, y, color)
+
+	def _touch(self, ymin, ymax):
+		if self.dirty:
+			ymin, ymax = min(ymin, self.dirty[0]), max(ymax, self.dirty[1])
+		self.dirty = (ymin, ymax)
+		if self.id is None:
+			self.id = self.canvas.create_image(0, 0, image=self.image, anchor=tkinter.NW)
+		if not self.scheduled:
+			self.scheduled = True
+			self.canvas.after_idle(self.push)
+
+	def push(self):
+		self.scheduled = False
+		if not self.dirty:
+			return
+		ymin, ymax = self.dirty
+		self.dirty = None
+		stride = self.width * 4
+		rows = [self.buffer[y * stride:(y + 1) * stride] for y in range(ymin, ymax + 1)]
+		data = _encodePNG(self.width, len(rows), rows)
+		self.image.tk.call(self.image.name, 'put', data, '-format', 'png', '-to', 0, ymin)
+
+	def reset(self):
+		# the canvas item is gone after GraphWin.clear; the image is blanked and re-placed on the next plot
+		self.buffer = bytearray(self.width * self.height * 4)
+		self.dirty = None
+		self.image.blank()
+		self.id = None
+
+def _encodePNG(width, height, rows, channels = 4):
+	'''Internal: encodes RGBA (or, with channels = 3, RGB) rows as base64 PNG data, the form PhotoImage.put accepts'''
+	def chunk(kind, data):
+		return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+	header = struct.pack('>IIBBBBB', width, height, 8, 6 if channels == 4 else 2, 0, 0, 0)
+	raw = b''.join([b'\x00' + bytes(row) for row in rows])
+	png = b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b'')
+	return base64.b64encode(png).decode('ascii')
+
+class OffscreenWin(GraphWin):
+
+	"""A GraphWin that draws into an in-memory image instead of a window, so that it needs
+	neither Tk nor a display. Requires PIL. The drawing is available as win.image (a PIL
+	image), win.getArray() (an RGBA NumPy array) or written to a file with win.save"""
+	# Implements the parts of the Tk canvas that the graphics objects use. Items
+	#   are kept as [kind, screen coordinates, options, tags] in stacking order,
+	#   and the image is rendered from them with PIL whenever it is asked for.
+	#   Other GraphWin subclasses render offscreen by putting OffscreenWin first
+	#   among their bases, e.g. class OffscreenGraph(OffscreenWin, Graph).
+
+	def __init__(self, width = 200, height = 200, title = "Graphics Window", raster = True):
+		GraphWin.__init__(self, None, width, height, False, title = title, raster = raster)
+
+	def _initSurface(self, master, title):
+		if not HAS_PIL:
+			raise GraphicsError("offscreen drawing requires the Python Imaging Library (PIL)")
+		self.master = None
+		self._w = "offscreen%d" % id(self)
+		self._title = title
+		self._surface = collections.OrderedDict()
+		self._surfaceCount = 0
+		self._surfaceConfig = {"bg": "white"}
+		self._fonts = {}
+		return None
+
+	def _update(self):
+		pass
+
+	def _pumpEvents(self, flags = 0):
+		return 0
+
+	def _pixels(self):
+		if not self._pixelLayer:
+			self._pixelLayer = _OffscreenPixels(self)
+		return self._pixelLayer
+
+	def _rgbaImage(self, width, height, buffer):
+		return PILImage.frombuffer("RGBA", (width, height), bytes(buffer), "raw", "RGBA", 0, 1)
+
+	def title(self, name):
+		self._title = name
+
+	def close(self):
+		self.closed = True
+
+	def getMouse(self, timeout = None):
+		raise GraphicsError("an offscreen window has no mouse")
+
+	def getKey(self, timeout = None):
+		raise GraphicsError("an offscreen window has no keyboard")
+
+	@property
+	def image(self):
+		'''The drawing, rendered as a PIL image'''
+		return self._render()
+
+	def getArray(self):
+		'''Returns the drawing as a height x width x 4 (RGBA) NumPy array'''
+		if not HAS_NUMPY:
+			raise GraphicsError("getArray requires NumPy")
+		return numpy.asarray(self._render())
+
+	def save(self, filepath = "graphwin.png"):
+		'''Saves the drawing under the given filepath'''
+		image = self._render()
+		if os.path.splitext(filepath)[1].lower() in (".jpg", ".jpeg", ".bmp"):
+			image = image.convert("RGB")
+		image.save(filepath)
+
+	# Tk canvas operations
+
+	def _create(self, kind, args, kw):
+		args = list(args)
+		options = args.pop() if args and isinstance(args[-1], dict) else {}
+		options = dict(options, **kw)
+		tags = options.pop("tags", ())
+		self._surfaceCount += 1
+		self._surface[self._surfaceCount] = [kind, [float(c) for c in tkinter._flatten(args)], options, set((tags,) if isinstance(tags, str) else tags)]
+		return self._surfaceCount
+
+	def create_line(self, *args, **kw):
+		return self._create("line", args, kw)
+
+	def create_rectangle(self, *args, **kw):
+		return self._create("rectangle", args, kw)
+
+	def create_oval(self, *args, **kw):
+		return self._create("oval", args, kw)
+
+	def create_polygon(self, *args, **kw):
+		return self._create("polygon", args, kw)
+
+	def create_text(self, *args, **kw):
+		return self._create("text", args, kw)
+
+	def create_image(self, *args, **kw):
+		return self._create("image", args, kw)
+
+	def create_window(self, *args, **kw):
+		raise GraphicsError("an offscreen window cannot hold widgets")
+
+	def find_withtag(self, tagOrId):
+		if tagOrId == tkinter.ALL:
+			return tuple(self._surface)
+		if isinstance(tagOrId, int) or (isinstance(tagOrId, str) and tagOrId.isdigit()):
+			return (int(tagOrId),) if int(tagOrId) in self._surface else ()
+		return tuple(key for key, item in self._surface.items() if tagOrId in item[3])
+
+	def find_all(self):
+		return tuple(self._surface)
+
+	def delete(self, *tags):
+		for tag in tags:
+			for key in self.find_withtag(tag):
+				del self._surface[key]
+
+	def move(self, tagOrId, dx, dy):
+		for key in self.find_withtag(tagOrId):
+			coords = self._surface[key][1]
+			for i in range(0, len(coords), 2):
+				coords[i] += dx
+				coords[i + 1] += dy
+
+	def scale(self, tagOrId, x0, y0, xs, ys):
+		for key in self.find_withtag(tagOrId):
+			coords = self._surface[key][1]
+			for i in range(0, len(coords), 2):
+				coords[i] = x0 + (coords[i] - x0) * xs
+				coords[i + 1] = y0 + (coords[i + 1] - y0) * ys
+
+	def coords(self, tagOrId, *args):
+		keys = self.find_withtag(tagOrId)
+		if not args:
+			return list(self._surface[keys[0]][1]) if keys else []
+		for key in keys[:1]:
+			self._surface[key][1] = [float(c) for c in tkinter._flatten(args)]
+
+	def insert(self, tagOrId, index, coords):
+		for key in self.find_withtag(tagOrId):
+			current = self._surface[key][1]
+			index = len(current) if index == tkinter.END else int(index)
+			current[index:index] = [float(c) for c in tkinter._flatten(coords)]
+
+	def itemconfig(self, tagOrId, cnf = None, **kw):
+		for key in self.find_withtag(tagOrId):
+			options = self._surface[key][2]
+			if cnf:
+				options.update(cnf)
+			options.update(kw)
+	itemconfigure = itemconfig
+
+	def addtag_withtag(self, newtag, tagOrId):
+		for key in self.find_withtag(tagOrId):
+			self._surface[key][3].add(newtag)
+
+	def dtag(self, tagOrId, tagToDelete = None):
+		for key in self.find_withtag(tagOrId):
+			self._surface[key][3].discard(tagToDelete if tagToDelete is not None else tagOrId)
+
+	def gettags(self, tagOrId):
+		keys = self.find_withtag(tagOrId)
+		return tuple(self._surface[keys[0]][3]) if keys else ()
+
+	def tag_raise(self, tagOrId, aboveThis = None):
+		self._restacked(tagOrId, aboveThis, True)
+		self._restack(tagOrId, aboveThis, True)
+	lift = tkraise = tag_raise
+
+	def tag_lower(self, tagOrId, belowThis = None):
+		self._restacked(tagOrId, belowThis, False)
+		self._restack(tagOrId, belowThis, False)
+	lower = tag_lower
+
+	def _restack(self, tagOrId, reference, above):
+		moved = [(key, self._surface.pop(key)) for key in self.find_withtag(tagOrId)]
+		rest = list(self._surface.items())
+		targets = set(self.find_withtag(reference)) if reference is not None else ()
+		indexes = [i for i, (key, item) in enumerate(rest) if key in targets]
+		if indexes:
+			position = indexes[-1] + 1 if above else indexes[0]
+		else:
+			position = len(rest) if above else 0
+		self._surface = collections.OrderedDict(rest[:position] + moved + rest[position:])
+
+	def bbox(self, *tags):
+		boxes = [self._itemBox(key) for tag in tags for key in self.find_withtag(tag)]
+		boxes = [box for box in boxes if box]
+		if not boxes:
+			return None
+		return (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+	def config(self, cnf = None, **kw):
+		options = dict(cnf or {}, **kw)
+		if "background" in options:
+			options["bg"] = options.pop("background")
+		self._surfaceConfig.update(options)
+	configure = config
+
+	def cget(self, key):
+		return self._surfaceConfig.get("bg" if key == "background" else key, "")
+
+	def winfo_rgb(self, color):
+		r, g, b = ImageColor.getrgb(color)[:3]
+		return (r * 257, g * 257, b * 257)
+
+	def winfo_rootx(self):
+		return 0
+
+	def winfo_rooty(self):
+		return 0
+
+	def grid(self, *args, **kw):
+		pass
+
+	def bind(self, *args, **kw):
+		pass
+
+	def update(self):
+		pass
+
+	def update_idletasks(self):
+		pass
+
+	# rendering
+
+	def _itemBox(self, key):
+		kind, coords, options, tags = self._surface[key]
+		if kind in ("text", "image"):
+			width, height = self._itemSize(kind, options)
+			x, y = _anchorCorner(coords[0], coords[1], width, height, options.get("anchor", tkinter.CENTER))
+			return (int(x), int(y), int(x + width), int(y + height))
+		if not coords:
+			return None
+		pad = float(options.get("width", 1)) / 2.0 + 1
+		xs, ys = coords[0::2], coords[1::2]
+		return (int(min(xs) - pad), int(min(ys) - pad), int(max(xs) + pad + 0.5), int(max(ys) + pad + 0.5))
+
+	def _itemSize(self, kind, options):
+		if kind == "image":
+			image = _pilImage(options.get("image"))
+			return image.size if image else (0, 0)
+		font = self._font(options.get("font"))
+		box = ImageDraw.Draw(PILImage.new("RGBA", (1, 1))).multiline_textbbox((0, 0), str(options.get("text", "")), font = font)
+		return (box[2] - box[0], box[3] - box[1])
+
+	def _font(self, font):
+		# Tk fonts are (family, size, style) tuples; fonts that PIL cannot find fall back to its default font
+		font = tuple(font) if isinstance(font, (tuple, list)) else ("helvetica", 12, "normal")
+		if font not in self._fonts:
+			family, size, style = (tuple(font) + ("helvetica", 12, "normal")[len(font):])[:3]
+			bold = "bold" in str(style)
+			loaded = None
+			for name in (family + (" bold" if bold else ""), family, "DejaVuSans-Bold" if bold else "DejaVuSans"):
+				try:
+					loaded = ImageFont.truetype(name.replace(" ", "") + ".ttf", abs(int(size)))
+					break
+				except (IOError, OSError):
+					pass
+			if loaded is None:
+				try:
+					loaded = ImageFont.load_default(abs(int(size)))
+				except TypeError:
+					loaded = ImageFont.load_default()
+			self._fonts[font] = loaded
+		return self._fonts[font]
+
+	def _render(self):
+		image = PILImage.new("RGBA", (int(self.width), int(self.height)), self._surfaceConfig.get("bg") or (0, 0, 0, 0))
+		draw = ImageDraw.Draw(image)
+		for kind, coords, options, tags in self._surface.values():
+			if options.get("state") == "hidden":
+				continue
+			fill, outline = options.get("fill"), options.get("outline")
+			width = int(float(options.get("width", 1)))
+			points = list(zip(coords[0::2], coords[1::2]))
+			if kind == "line":
+				if fill != "" and len(points) > 1:
+					draw.line(points, fill or "black", width)
+			elif kind in ("rectangle", "oval"):
+				(x1, y1), (x2, y2) = points[:2]
+				box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+				paint = draw.rectangle if kind == "rectangle" else draw.ellipse
+				paint(box, fill or None, None if outline == "" else (outline or "black"), width)
+			elif kind == "polygon":
+				if len(points) > 2:
+					draw.polygon(points, None if fill == "" else (fill or "black"), outline or None)
+			elif kind == "text":
+				font = self._font(options.get("font"))
+				text = str(options.get("text", ""))
+				box = draw.multiline_textbbox((0, 0), text, font = font)
+				x, y = _anchorCorner(coords[0], coords[1], box[2] - box[0], box[3] - box[1], options.get("anchor", tkinter.CENTER))
+				draw.multiline_text((x - box[0], y - box[1]), text, fill or "black", font, align = options.get("justify", "center"))
+			elif kind == "image":
+				pasted = _pilImage(options.get("image"))
+				if pasted:
+					x, y = _anchorCorner(coords[0], coords[1], pasted.size[0], pasted.size[1], options.get("anchor", tkinter.CENTER))
+					pasted = pasted.convert("RGBA")
+					image.paste(pasted, (int(x), int(y)), pasted)
+		return image
+
+class _OffscreenPixels(_PixelLayer):
+
+	"""Internal class for the pixel layer of an OffscreenWin: the RGBA buffer itself is the image"""
+
+	def __init__(self, canvas):
+		self.canvas = canvas
+		self.width, self.height = int(canvas.width), int(canvas.height)
+		self.image = self
+		self.buffer = bytearray(self.width * self.height * 4)
+		self.colors = {}
+		self.id = None
+		self.dirty = None
+		self.scheduled = False
+
+	def _touch(self, ymin, ymax):
+		if self.id is None:
+			self.id = self.canvas.create_image(0, 0, image=self.image, anchor=tkinter.NW)
+
+	def push(self):
+		pass
+
+	def reset(self):
+		self.buffer = bytearray(self.width * self.height * 4)
+		self.id = None
+
+	def _pil(self):
+		return PILImage.frombuffer("RGBA", (self.width, self.height), bytes(self.buffer), "raw", "RGBA", 0, 1)
+
+class _PILPhoto:
+
+	"""Internal stand-in for tkinter.PhotoImage, backed by a PIL image, for Images created
+	while Tk has no root window (i.e. for offscreen drawing)"""
+
+	def __init__(self, file = None, width = 0, height = 0, image = None):
+		if image is None:
+			image = PILImage.open(file).convert("RGBA") if file else PILImage.new("RGBA", (int(width), int(height)))
+		self.image = image
+
+	def width(self):
+		return self.image.size[0]
+
+	def height(self):
+		return self.image.size[1]
+
+	def get(self, x, y):
+		return self.image.getpixel((x, y))[:3]
+
+	def put(self, data, to = None):
+		color = ImageColor.getrgb(data.strip("{} "))
+		if to is None or len(to) == 2:
+			x, y = to or (0, 0)
+			self.image.putpixel((x, y), color)
+		else:
+			ImageDraw.Draw(self.image).rectangle((to[0], to[1], to[2] - 1, to[3] - 1), color)
+
+	def write(self, filename, format = None):
+		self.image.save(filename)
+
+	def copy(self):
+		return _PILPhoto(image = self.image.copy())
+
+	def blank(self):
+		self.image = PILImage.new("RGBA", self.image.size)
+
+	def _pil(self):
+		return self.image
+
+def _newPhoto(file = None, width = 0, height = 0):
+	'''Internal: returns a PhotoImage, or a PIL-backed stand-in when Tk has no root window to own one'''
+	if _root is None and getattr(tkinter, "_default_root", None) is None and HAS_PIL:
+		return _PILPhoto(file, width, height)
+	if file:
+		return tkinter.PhotoImage(file=file, master=_root)
+	return tkinter.PhotoImage(master=_root, width=width, height=height)
+
+def _pilImage(image):
+	'''Internal: returns what an OffscreenWin image item shows as a PIL image'''
+	if image is None or (HAS_PIL and isinstance(image, PILImage.Image)):
+		return image
+	if hasattr(image, "_pil"):
+		return image._pil()
+	# a tkinter.PhotoImage, read back as PNG
+	data = image.tk.call(image.name, "data", "-format", "png")
+	return PILImage.open(io.BytesIO(base64.b64decode(data)))
+
+def _anchorCorner(x, y, width, height, anchor):
+	'''Internal: the upper-left corner of a width x height box placed at (x, y) with a Tk anchor'''
+	anchor = str(anchor)
+	if anchor == tkinter.CENTER:
+		anchor = ""
+	dx = 0 if "w" in anchor else (width if "e" in anchor else width / 2.0)
+	dy = 0 if "n" in anchor else (height if "s" in anchor else height / 2.0)
+	return x - dx, y - dy
+
+# everything in PhotoImage color data that is not part of a #rrggbb color
+_NOT_HEX = re.compile("[^0-9a-fA-F]")
+
+def _resolve(waiters, value):
+	'''Internal: sets the result of every pending asyncio future in waiters and empties it.
+	Returns whether any future took the value'''
+	taken = False
+	for future in waiters:
+		if not future.done():
+			future.set_result(value)
+			taken = True
+	del waiters[:]
+	return taken
+
+class _SpatialIndex:
+
+	"""Internal class for a uniform grid over the bounding boxes (in world coordinates) of drawn objects"""
+	# Objects covering more than MAX_CELLS cells are kept in a separate list that
+	#   every query checks, so a few very large items don't flood the grid.
+
+	MAX_CELLS = 1024
+
+	def __init__(self, xsize, ysize):
+		self.xsize = abs(xsize) or 1.0
+		self.ysize = abs(ysize) or 1.0
+		self.cells = {}
+		self.large = set()
+		self.entries = {}
+
+	def _span(self, x1, y1, x2, y2):
+		return (int(math.floor(x1 / self.xsize)), int(math.floor(y1 / self.ysize)),
+			int(math.floor(x2 / self.xsize)), int(math.floor(y2 / self.ysize)))
+
+	def insert(self, item):
+		bounds = item._bounds()
+		if bounds is None:
+			return
+		i1, j1, i2, j2 = span = self._span(*bounds)
+		if (i2 - i1 + 1) * (j2 - j1 + 1) > self.MAX_CELLS:
+			self.large.add(item)
+		else:
+			cells = self.cells
+			for i in range(i1, i2 + 1):
+				for j in range(j1, j2 + 1):
+					cell = cells.get((i, j))
+					if cell is None:
+						cell = cells[(i, j)] = set()
+					cell.add(item)
+		self.entries[item] = (bounds, span)
+
+	def remove(self, item):
+		entry = self.entries.pop(item, None)
+		if entry is None:
+			return
+		if item in self.large:
+			self.large.discard(item)
+			return
+		i1, j1, i2, j2 = entry[1]
+		cells = self.cells
+		for i in range(i1, i2 + 1):
+			for j in range(j1, j2 + 1):
+				cell = cells.get((i, j))
+				if cell is not None:
+					cell.discard(item)
+					if not cell:
+						del cells[(i, j)]
+
+	def update(self, item):
+		self.remove(item)
+		self.insert(item)
+
+	def query(self, x1, y1, x2, y2):
+		i1, j1, i2, j2 = self._span(x1, y1, x2, y2)
+		found = set(self.large)
+		cells = self.cells
+		if (i2 - i1 + 1) * (j2 - j1 + 1) > len(cells):
+			for cell in cells.values():
+				found.update(cell)
+		else:
+			for i in range(i1, i2 + 1):
+				for j in range(j1, j2 + 1):
+					cell = cells.get((i, j))
+					if cell:
+						found.update(cell)
+		entries = self.entries
+		hits = []
+		for item in found:
+			bx1, by1, bx2, by2 = entries[item][0]
+			if bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2:
+				hits.append(item)
+		return hits
+
+class _ImageMirror:
+
+	"""Internal class that replays drawing commands onto the PIL image of a
+	GraphWin (save_image = True) on a background thread"""
+	# Commands are queued by the Tk thread and drawn by the worker. Every drawn
+	#   canvas item keeps its list of commands, so undraw and move are applied
+	#   by re-rendering the image from the remaining commands once the queue
+	#   runs dry. Once stopped, the worker exits after the commands queued
+	#   before stop, and wait applies any queued later on the calling thread.
+
+	def __init__(self, width, height):
+		self.size = (width, height)
+		self.image = PILImage.new('RGBA', self.size)
+		self.items = collections.OrderedDict()
+		self.files = {}
+		self.count = 0
+		self.dirty = False
+		self.stopped = False
+		self.queue = queue.Queue()
+		self.worker = threading.Thread(target=self._run)
+		self.worker.daemon = True
+		self.worker.start()
+
+	def draw(self, key, method, *args, **kwargs):
+		# key is the canvas id of the drawn item, or None for pixels (which can't be undrawn)
+		self.queue.put(("draw", key, method, args, kwargs))
+
+	def undraw(self, key):
+		self.queue.put(("undraw", key))
+
+	def move(self, key, dx, dy):
+		self.queue.put(("move", key, (1, dx, 1, dy)))
+
+	def transform(self, key, affine):
+		# affine is (ax, bx, ay, by): x becomes ax * x + bx and y becomes ay * y + by
+		self.queue.put(("move", key, affine))
+
+	def clear(self):
+		# the commands still queued are superseded, so they are dropped rather than drawn
+		try:
+			while True:
+				self.queue.get_nowait()
+				self.queue.task_done()
+		except queue.Empty:
+			pass
+		self.queue.put(("clear",))
+		if self.stopped:
+			self.queue.put(None)
+
+	def stop(self):
+		self.stopped = True
+		self.queue.put(None)
+
+	def wait(self):
+		# blocks until every queued command has been drawn
+		if not self.stopped:
+			self.queue.join()
+			return self.image
+		# the worker exits at the first None, so whatever was queued after it is drawn here
+		self.worker.join()
+		try:
+			while True:
+				command = self.queue.get_nowait()
+				self.queue.task_done()
+				if command is not None:
+					self._apply(command)
+		except queue.Empty:
+			pass
+		if self.dirty:
+			self._render()
+		return self.image
+
+	def _run(self):
+		while True:
+			command = self.queue.get()
+			try:
+				if command is None:
+					return
+				self._apply(command)
+				if self.dirty and self.queue.empty():
+					self._render()
+			except Exception:
+				pass # a command PIL can't draw must not stop the worker
+			finally:
+				self.queue.task_done()
+
+	def _apply(self, command):
+		kind = command[0]
+		if kind == "draw":
+			key = command[1]
+			if key is None:
+				self.count += 1
+				key = ("pixels", self.count)
+			self.items.setdefault(key, []).append(command[2:])
+			if not self.dirty:
+				self._paint(ImageDraw.Draw(self.image), *command[2:])
+		elif kind == "undraw":
+			if self.items.pop(command[1], None) is not None:
+				self.dirty = True
+		elif kind == "move":
+			commands = self.items.get(command[1])
+			if commands:
+				for i, (method, args, kwargs) in enumerate(commands):
+					commands[i] = (method, _mapMirrorArgs(method, args, command[2]), kwargs)
+				self.dirty = True
+		elif kind == "clear":
+			self.items.clear()
+			self.image = PILImage.new('RGBA', self.size)
+			self.dirty = False
+
+	def _render(self):
+		self.dirty = False
+		self.image = PILImage.new('RGBA', self.size)
+		drawing = ImageDraw.Draw(self.image)
+		for commands in self.items.values():
+			for command in commands:
+				try:
+					self._paint(drawing, *command)
+				except Exception:
+					pass
+
+	def _paint(self, drawing, method, args, kwargs):
+		if method == "paste":
+			# args are (filename, (x, y)); the file is decoded here, off the Tk thread
+			filename, box = args
+			picture = self.files.get(filename)
+			if picture is None:
+				picture = self.files[filename] = PILImage.open(filename).convert('RGBA')
+			box = (int(box[0] - picture.size[0] / 2), int(box[1] - picture.size[1] / 2))
+			self.image.paste(picture, box, picture)
+		else:
+			getattr(drawing, method)(*args, **kwargs)
+
+def _mapMirrorArgs(method, args, affine):
+	'''Internal: returns the arguments of a mirrored drawing command with its coordinates mapped
+	through affine, (ax, bx, ay, by)'''
+	ax, bx, ay, by = affine
+	if method == "paste":
+		return (args[0], (args[1][0] * ax + bx, args[1][1] * ay + by))
+	xy = args[0]
+	if len(xy) and isinstance(xy[0], (tuple, list)):
+		xy = [(x * ax + bx, y * ay + by) for x, y in xy]
+	else:
+		xy = [value * ay + by if i % 2 else value * ax + bx for i, value in enumerate(xy)]
+		if method in ("rectangle", "ellipse"):
+			# PIL wants the corners in order, which a flipped axis reverses
+			xy = [min(xy[0], xy[2]), min(xy[1], xy[3]), max(xy[0], xy[2]), max(xy[1], xy[3])]
+	return (xy,) + tuple(args[1:])
+
 class Transform:
 
 	"""Internal class for 2-D coordinate transformations"""
@@ -451,16 +2149,58 @@ class Transform:
 		
 	def screen(self,x,y):
 		# Returns x,y in screen (actually window) coordinates
+		if _isSequence(x):
+			return self.screenMany(x, y)
 		xs = (x-self.xbase) / self.xscale
 		ys = (self.ybase-y) / self.yscale
 		return int(xs+0.5),int(ys+0.5)
 		
+	def screenMany(self, xs, ys):
+		# Returns the sequences xs, ys in screen coordinates; NumPy arrays if NumPy is available
+		if HAS_NUMPY:
+			xs = (numpy.asarray(xs, dtype=float) - self.xbase) / self.xscale
+			ys = (self.ybase - numpy.asarray(ys, dtype=float)) / self.yscale
+			return (xs + 0.5).astype(int), (ys + 0.5).astype(int)
+		xbase, ybase, xscale, yscale = self.xbase, self.ybase, self.xscale, self.yscale
+		return [int((x - xbase) / xscale + 0.5) for x in xs], [int((ybase - y) / yscale + 0.5) for y in ys]
+
 	def world(self,xs,ys):
 		# Returns xs,ys in world coordinates
+		if _isSequence(xs):
+			return self.worldMany(xs, ys)
 		x = xs*self.xscale + self.xbase
 		y = self.ybase - ys*self.yscale
 		return x,y
 
+	def worldMany(self, xs, ys):
+		# Returns the sequences xs, ys in world coordinates; NumPy arrays if NumPy is available
+		if HAS_NUMPY:
+			xs = numpy.asarray(xs, dtype=float) * self.xscale + self.xbase
+			ys = self.ybase - numpy.asarray(ys, dtype=float) * self.yscale
+			return xs, ys
+		xbase, ybase, xscale, yscale = self.xbase, self.ybase, self.xscale, self.yscale
+		return [x * xscale + xbase for x in xs], [ybase - y * yscale for y in ys]
+
+	def mapFrom(self, other):
+		# Returns (ax, bx, ay, by) such that ax * x + bx, ay * y + by maps screen
+		# coordinates under other (a Transform, or None for raw pixels) to this one
+		if other is None:
+			return 1 / self.xscale, -self.xbase / self.xscale, -1 / self.yscale, self.ybase / self.yscale
+		return (other.xscale / self.xscale, (other.xbase - self.xbase) / self.xscale,
+			other.yscale / self.yscale, (self.ybase - other.ybase) / self.yscale)
+
+def _isSequence(value):
+	'''Internal: whether value is a sequence (or array) of coordinates rather than a single number'''
+	return hasattr(value, '__len__') and not isinstance(value, str)
+
+def _offset(values, delta):
+	'''Internal: adds delta to a coordinate or to every coordinate of a sequence'''
+	if not _isSequence(values):
+		return values + delta
+	if HAS_NUMPY:
+		return numpy.asarray(values) + delta
+	return [value + delta for value in values]
+
 # Default values for various item configuration options. Only a subset of
 #   keys may be present in the configuration dictionary for a given item
 DEFAULT_CONFIG = {"fill":"",
@@ -471,33 +2211,60 @@ DEFAULT_CONFIG = {"fill":"",
 	"justify":"center",
 				"font": ("helvetica", 12, "normal")}
 
-class GraphicsObject:
+# Configuration dictionaries holding only default values, shared by every
+#   object built with the same options until one of them is reconfigured
+_SHARED_CONFIGS = {}
+
+class GraphicsObject(object):
 
 	"""Generic base class for all of the drawable objects"""
 	# A subclass of GraphicsObject should override _draw and
 	#   and _move methods.
+
+	__slots__ = ("canvas", "id", "config", "_sharedConfig", "_stack", "__weakref__")
+
+	# maps the option a setter names to the option the object actually
+	#   uses, e.g. setFill changes the outline of a Point
+	_aliases = {}
+
+	# the DisplayList kind of the object, or None if it cannot be recorded
+	_kind = None
+
+	# how a culling window (GraphWin.setCulling) treats the object: "cull" leaves it off the
+	#   canvas while its bounds are out of view, "draw" only draws it again when the
+	#   coordinates change and None leaves its canvas item alone
+	_cullMode = "cull"
 	
-	def __init__(self, options):
+	def __init__(self, options, defaults = None):
 		# options is a list of strings indicating which options are
-		# legal for this object.
+		# legal for this object; defaults overrides DEFAULT_CONFIG.
 		# When an object is drawn, canvas is set to the GraphWin(canvas)
 		#    object where it is drawn and id is the TK identifier of the
 		#    drawn shape.
 		self.canvas = None
 		self.id = None
+		self._stack = 0 # while drawn, the object's place in the stacking order (see GraphWin._topmostFirst)
 		# config is the dictionary of configuration options for the widget.
-		config = {}
-		for option in options:
-			config[option] = DEFAULT_CONFIG[option]
+		#    It is shared (copy-on-write) until _reconfig changes it.
+		key = (tuple(options), tuple(sorted(defaults.items())) if defaults else ())
+		config = _SHARED_CONFIGS.get(key)
+		if config is None:
+			config = {}
+			for option in options:
+				config[option] = DEFAULT_CONFIG[option]
+			if defaults:
+				config.update(defaults)
+			_SHARED_CONFIGS[key] = config
 		self.config = config
+		self._sharedConfig = True
 		
 	def setFill(self, color):
 		"""Set interior color to color"""
-		self._reconfig("fill", color)
+		self._reconfig(self._aliases.get("fill", "fill"), color)
 		
 	def setOutline(self, color):
 		"""Set outline color to color"""
-		self._reconfig("outline", color)
+		self._reconfig(self._aliases.get("outline", "outline"), color)
 		
 	def setWidth(self, width):
 		"""Set line weight to width"""
@@ -514,10 +2281,28 @@ class GraphicsObject:
 		if graphwin.isClosed():
 			raise GraphicsError("Can't draw to closed window")
 		self.canvas = graphwin
-		self.id = self._draw(graphwin, self.config)
-		if graphwin.autoflush:
-			_root.update()
-		graphwin.all_objects[self.id] = self
+		try:
+			if graphwin._culling is not None and self._cullMode:
+				graphwin._culling[self] = _groupTags(self)
+				if self._cullMode != "cull" or graphwin._inView(self):
+					graphwin._materialize(self)
+			else:
+				self.id = self._draw(graphwin, self.config)
+				if self.id is not None:
+					graphwin._adopt(self)
+				else:
+					graphwin._pending[self] = None
+		except Exception:
+			# the object is left undrawn
+			if graphwin._culling is not None:
+				graphwin._culling.pop(self, None)
+			self.canvas = self.id = None
+			raise
+		if graphwin._index is not None:
+			graphwin._index.insert(self)
+		if graphwin._recording is not None and self._kind:
+			graphwin._recording.add(self._kind, self._record(), self.config, self)
+		graphwin._autoflush()
 		
 	def undraw(self):
 		global _root
@@ -525,14 +2310,28 @@ class GraphicsObject:
 		object is not currently drawn."""
 		if not self.canvas:
 			return
-		if not self.canvas.isClosed():
+		if not self.canvas.isClosed() and self.id is not None:
 			self.canvas.delete(self.id)
-			if self.canvas.autoflush:
-				_root.update()
-			try:
-				del self.canvas.all_objects[self.id]
-			except (AttributeError, KeyError):
-				pass
+			self.canvas._autoflush()
+			if self.canvas.save_image:
+				self.canvas._mirror.undraw(self.id)
+		self._detach()
+
+	def _detach(self):
+		# Internal method: forgets the drawn state of the object once its
+		#    canvas item is gone
+		canvas = self.canvas
+		try:
+			del canvas.all_objects[self.id]
+		except (AttributeError, KeyError):
+			pass
+		if canvas._index is not None:
+			canvas._index.remove(self)
+		if canvas._recording is not None:
+			canvas._recording.remove(self)
+		if canvas._culling is not None:
+			canvas._culling.pop(self, None)
+		canvas._pending.pop(self, None)
 		self.canvas = None
 		self.id = None
 
@@ -550,9 +2349,17 @@ class GraphicsObject:
 			else:
 				x = dx
 				y = dy
-			self.canvas.move(self.id, x, y)
-			if canvas.autoflush:
-				_root.update()
+			if self.id is not None:
+				self.canvas.move(self.id, x, y)
+				if canvas.save_image:
+					canvas._mirror.move(self.id, x, y)
+			if canvas._culling is not None:
+				canvas._checkView(self)
+			if canvas._index is not None:
+				canvas._index.update(self)
+			if canvas._recording is not None:
+				canvas._recording.move(self, dx, dy)
+			canvas._autoflush()
 		
 	def _reconfig(self, option, setting):
 		global _root
@@ -561,12 +2368,24 @@ class GraphicsObject:
 		#    dictionary for this object
 		if option not in self.config:
 			raise GraphicsError(UNSUPPORTED_METHOD)
+		if self._sharedConfig:
+			self.config = self.config.copy()
+			self._sharedConfig = False
 		options = self.config
 		options[option] = setting
 		if self.canvas and not self.canvas.isClosed():
-			self.canvas.itemconfig(self.id, options)
-			if self.canvas.autoflush:
-				_root.update()
+			if self.id is not None:
+				self.canvas.itemconfig(self.id, options)
+			if self.canvas._recording is not None:
+				self.canvas._recording.configure(self, options)
+			self.canvas._autoflush()
+
+	def _shareConfig(self, other):
+		# Internal method for clones: other shares this object's configuration
+		#    until either of them is reconfigured
+		other.config = self.config
+		other._sharedConfig = self._sharedConfig = True
+		return other
 
 	def getColor(self, attribute):
 		'''Gets the color'''
@@ -582,41 +2401,104 @@ class GraphicsObject:
 		Returns Tk id of item drawn"""
 		pass # must override in subclass
 
+	def _bounds(self):
+		"""returns the bounding box (xmin, ymin, xmax, ymax) of the object
+		in world coordinates, or None if it is not known"""
+		# by default, measured from the drawn canvas item; subclasses with
+		#   known geometry override this
+		if not self.canvas or self.canvas.isClosed() or self.id is None:
+			return None
+		box = self.canvas.bbox(self.id)
+		if not box:
+			return None
+		x1, y1 = self.canvas.toWorld(box[0], box[1])
+		x2, y2 = self.canvas.toWorld(box[2], box[3])
+		return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
 	def _move(self, dx, dy):
 		"""updates internal state of object to move it dx,dy units"""
 		pass # must override in subclass
+
+	def _itemDeleted(self):
+		"""called when a culling window deletes the object's canvas item
+		while the object stays drawn"""
+		pass
+
+	def _screen(self, canvas):
+		"""returns the coordinates of the drawn canvas item in the window's
+		current coordinates, or None if they are not known"""
+		return None
+
+	def _reproject(self, canvas, affine):
+		"""moves the drawn canvas item to the object's place after the window's
+		coordinates changed; affine maps old screen coordinates to new ones"""
+		coords = self._screen(canvas)
+		if coords is None:
+			ax, bx, ay, by = affine
+			canvas.scale(self.id, 0, 0, ax, ay)
+			canvas.move(self.id, bx, by)
+		else:
+			canvas.coords(self.id, *coords)
+		if canvas.save_image:
+			canvas._mirror.transform(self.id, affine)
+
+	def _record(self):
+		"""returns the world coordinates of the object as a flat sequence,
+		for objects with a DisplayList kind"""
+		pass # must override in subclasses that set _kind
 		
 class Point(GraphicsObject):
+
+	__slots__ = ("x", "y")
+	_aliases = {"fill": "outline"}
+	_kind = "point"
+
 	def __init__(self, x, y):
 		GraphicsObject.__init__(self, ["outline", "fill"])
-		self.setFill = self.setOutline
 		self.x = x
 		self.y = y
 		
 	def _draw(self, canvas, options):
 		x,y = canvas.toScreen(self.x,self.y)
-		if self.save_image:
-			self.drawing_image.point((x, y), color)
-		return canvas.create_rectangle(x,y,x+1,y+1,options)
+		item = canvas.create_rectangle(x,y,x+1,y+1,options)
+		if canvas.save_image:
+			canvas._mirror.draw(item, 'point', (x, y), self.getColor('outline'))
+		return item
 		
 	def _move(self, dx, dy):
 		self.x = self.x + dx
 		self.y = self.y + dy
 		
 	def clone(self):
-		other = Point(self.x,self.y)
-		other.config = self.config.copy()
-		return other
+		# skips __init__: a clone only needs the coordinates and the shared config
+		other = Point.__new__(Point)
+		other.canvas = other.id = None
+		other._stack = 0
+		other.x = self.x
+		other.y = self.y
+		return self._shareConfig(other)
 				
 	def getX(self): return self.x
 	def getY(self): return self.y
 
+	def _record(self):
+		return (self.x, self.y)
+
+	def _screen(self, canvas):
+		x, y = canvas.toScreen(self.x, self.y)
+		return (x, y, x + 1, y + 1)
+
+	def _bounds(self):
+		return (self.x, self.y, self.x, self.y)
+
 class _BBox(GraphicsObject):
 	# Internal base class for objects represented by bounding box
 	# (opposite corners) Line segment is a degenerate case.
+
+	__slots__ = ("p1", "p2")
 	
-	def __init__(self, p1, p2, options=["outline","width","fill"]):
-		GraphicsObject.__init__(self, options)
+	def __init__(self, p1, p2, options=["outline","width","fill"], defaults = None):
+		GraphicsObject.__init__(self, options, defaults)
 		self.p1 = p1.clone()
 		self.p2 = p2.clone()
 
@@ -629,6 +2511,16 @@ class _BBox(GraphicsObject):
 	def getP1(self): return self.p1.clone()
 
 	def getP2(self): return self.p2.clone()
+
+	def _bounds(self):
+		p1, p2 = self.p1, self.p2
+		return (min(p1.x, p2.x), min(p1.y, p2.y), max(p1.x, p2.x), max(p1.y, p2.y))
+
+	def _record(self):
+		return (self.p1.x, self.p1.y, self.p2.x, self.p2.y)
+
+	def _screen(self, canvas):
+		return canvas.toScreen(self.p1.x, self.p1.y) + canvas.toScreen(self.p2.x, self.p2.y)
 	
 	def getCenter(self):
 		p1 = self.p1
@@ -636,6 +2528,9 @@ class _BBox(GraphicsObject):
 		return Point((p1.x+p2.x)/2.0, (p1.y+p2.y)/2.0)
 	
 class Rectangle(_BBox):
+
+	__slots__ = ()
+	_kind = "rectangle"
 	
 	def __init__(self, p1, p2):
 		_BBox.__init__(self, p1, p2)
@@ -645,35 +2540,38 @@ class Rectangle(_BBox):
 		p2 = self.p2
 		x1,y1 = canvas.toScreen(p1.x,p1.y)
 		x2,y2 = canvas.toScreen(p2.x,p2.y)
+		item = canvas.create_rectangle(x1,y1,x2,y2,options)
 		if canvas.save_image:
-			canvas.drawing_image.rectangle((x1, y2, x2 + 1, y1 + 1), self.getColor('fill'), self.getColor('outline'))
-		return canvas.create_rectangle(x1,y1,x2,y2,options)
+			canvas._mirror.draw(item, 'rectangle', (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)), self.getColor('fill'), self.getColor('outline'))
+		return item
 		
 	def clone(self):
-		other = Rectangle(self.p1, self.p2)
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Rectangle(self.p1, self.p2))
 		
 class Oval(_BBox):
+
+	__slots__ = ()
+	_kind = "oval"
 	
 	def __init__(self, p1, p2):
 		_BBox.__init__(self, p1, p2)
 		
 	def clone(self):
-		other = Oval(self.p1, self.p2)
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Oval(self.p1, self.p2))
 
 	def _draw(self, canvas, options):
 		p1 = self.p1
 		p2 = self.p2
 		x1,y1 = canvas.toScreen(p1.x,p1.y)
 		x2,y2 = canvas.toScreen(p2.x,p2.y)
+		item = canvas.create_oval(x1,y1,x2,y2,options)
 		if canvas.save_image:
-			canvas.drawing_image.ellipse((x1, y2, x2, y1), self.getColor('fill'), self.getColor('outline'))
-		return canvas.create_oval(x1,y1,x2,y2,options)
+			canvas._mirror.draw(item, 'ellipse', (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)), self.getColor('fill'), self.getColor('outline'))
+		return item
 	
 class Circle(Oval):
+
+	__slots__ = ("radius",)
 	
 	def __init__(self, center, radius):
 		p1 = Point(center.x-radius, center.y-radius)
@@ -682,33 +2580,32 @@ class Circle(Oval):
 		self.radius = radius
 		
 	def clone(self):
-		other = Circle(self.getCenter(), self.radius)
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Circle(self.getCenter(), self.radius))
 		
 	def getRadius(self):
 		return self.radius
 			
 class Line(_BBox):
+
+	__slots__ = ()
+	_aliases = {"outline": "fill"}
+	_kind = "line"
 	
 	def __init__(self, p1, p2):
-		_BBox.__init__(self, p1, p2, ["arrow","fill","width"])
-		self.setFill(DEFAULT_CONFIG['outline'])
-		self.setOutline = self.setFill
+		_BBox.__init__(self, p1, p2, ["arrow","fill","width"], {"fill": DEFAULT_CONFIG['outline']})
 
 	def clone(self):
-		other = Line(self.p1, self.p2)
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Line(self.p1, self.p2))
 
 	def _draw(self, canvas, options):
 		p1 = self.p1
 		p2 = self.p2
 		x1,y1 = canvas.toScreen(p1.x,p1.y)
 		x2,y2 = canvas.toScreen(p2.x,p2.y)
+		item = canvas.create_line(x1,y1,x2,y2,options)
 		if canvas.save_image:
-			canvas.drawing_image.line((x1, y1, x2, y2), self.getColor('fill'))
-		return canvas.create_line(x1,y1,x2,y2,options)
+			canvas._mirror.draw(item, 'line', (x1, y1, x2, y2), self.getColor('fill'))
+		return item
 		
 	def setArrow(self, option):
 		if not option in ["first","last","both","none"]:
@@ -716,6 +2613,9 @@ class Line(_BBox):
 		self._reconfig("arrow", option)
 		
 class Polygon(GraphicsObject):
+
+	__slots__ = ("points",)
+	_kind = "polygon"
 	
 	def __init__(self, *points):
 		# if points passed as a list, extract it
@@ -725,17 +2625,28 @@ class Polygon(GraphicsObject):
 		GraphicsObject.__init__(self, ["outline", "width", "fill"])
 		
 	def clone(self):
-		other = Polygon(*self.points)
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Polygon(*self.points))
 
 	def getPoints(self):
 		return list(map(Point.clone, self.points))
 
+	def _bounds(self):
+		xs = [p.x for p in self.points]
+		ys = [p.y for p in self.points]
+		return (min(xs), min(ys), max(xs), max(ys))
+
 	def _move(self, dx, dy):
 		for p in self.points:
 			p.move(dx,dy)
 
+	def _record(self):
+		return _flatten(self.points)
+
+	def _screen(self, canvas):
+		points = self.points
+		xs, ys = canvas.toScreen([p.x for p in points], [p.y for p in points])
+		return _interleave(xs, ys)
+
 	def _draw(self, canvas, options):
 		args = [canvas]
 		image_args = []
@@ -745,34 +2656,300 @@ class Polygon(GraphicsObject):
 			args.append(y)
 			image_args.append((x, y))
 		args.append(options)
+		item = GraphWin.create_polygon(*args)
 		if canvas.save_image:
 			if len(image_args) > 2:
-				canvas.drawing_image.polygon(image_args, self.getColor('fill'), self.getColor('outline'))
-		return GraphWin.create_polygon(*args) 
+				canvas._mirror.draw(item, 'polygon', image_args, self.getColor('fill'), self.getColor('outline'))
+		return item
+
+class Polyline(GraphicsObject):
+
+	"""A connected path through any number of points, drawn as a single canvas line"""
+
+	__slots__ = ("coords",)
+	_aliases = {"outline": "fill"}
+	_kind = "polyline"
+
+	def __init__(self, *points):
+		# accepts Points (or a list of them) or a flat sequence of
+		#   coordinates x1, y1, x2, y2, ... (which may be a NumPy array)
+		GraphicsObject.__init__(self, ["arrow","fill","width"], {"fill": DEFAULT_CONFIG['outline']})
+		if len(points) == 1 and _isSequence(points[0]):
+			points = points[0]
+		self.coords = array.array('d', _flatten(points))
+
+	def __len__(self):
+		return len(self.coords) // 2
+
+	def clone(self):
+		return self._shareConfig(Polyline(self.coords))
+
+	def getPoints(self):
+		coords = self.coords
+		return [Point(coords[i], coords[i + 1]) for i in range(0, len(coords), 2)]
+
+	def append(self, x, y = None):
+		"""Adds the point (x, y), or a Point, to the end of the line"""
+		if y is None:
+			x, y = x.x, x.y
+		self.extend((x, y))
+
+	def extend(self, points):
+		"""Adds Points, or a flat sequence of coordinates, to the end of the line.
+		A drawn line is extended with a single canvas command"""
+		start = len(self.coords)
+		self.coords.extend(_flatten(points))
+		canvas = self.canvas
+		if canvas and not canvas.isClosed() and len(self.coords) > start:
+			if self.id is None:
+				# drawn without points, or culled: the item is created now (if in view)
+				if canvas._culling is not None:
+					canvas._checkView(self)
+				else:
+					self.id = self._draw(canvas, self.config)
+					canvas._adopt(self)
+			elif start < 4:
+				# the drawn item was padded out to two points
+				coords = self._screenCoords(canvas)
+				canvas.coords(self.id, *coords)
+				if canvas.save_image:
+					canvas._mirror.undraw(self.id)
+					canvas._mirror.draw(self.id, 'line', coords, self.getColor('fill'), int(float(self.config['width'])))
+			else:
+				new = self._screenCoords(canvas, start - 2)
+				canvas.insert(self.id, tkinter.END, new[2:])
+				if canvas.save_image:
+					canvas._mirror.draw(self.id, 'line', new, self.getColor('fill'), int(float(self.config['width'])))
+			if canvas._index is not None:
+				canvas._index.update(self)
+			if canvas._recording is not None:
+				canvas._recording.extend(self, self.coords[start:])
+			canvas._autoflush()
+
+	def _screenCoords(self, canvas, start = 0):
+		# the line's coordinates from index start on, in screen coordinates, as a flat list
+		coords = self.coords[start:]
+		xs, ys = canvas.toScreen(coords[0::2], coords[1::2])
+		return _interleave(xs, ys)
+
+	def _bounds(self):
+		if not self.coords:
+			return None
+		xs, ys = self.coords[0::2], self.coords[1::2]
+		return (min(xs), min(ys), max(xs), max(ys))
+
+	def _move(self, dx, dy):
+		_shift(self.coords, dx, dy)
+
+	def _record(self):
+		return self.coords
+
+	def _screen(self, canvas):
+		coords = self._screenCoords(canvas)
+		return coords * 2 if len(coords) == 2 else coords
+
+	def _draw(self, canvas, options):
+		if not self.coords:
+			return None # the item is created once points are added
+		coords = self._screenCoords(canvas)
+		if len(coords) == 2:
+			coords = coords * 2
+		item = canvas.create_line(coords, options)
+		if canvas.save_image:
+			canvas._mirror.draw(item, 'line', coords, self.getColor('fill'), int(float(self.config['width'])))
+		return item
+
+class PointCloud(GraphicsObject):
+
+	"""A set of square markers drawn as a single canvas item (an image of the markers)"""
+	# The markers are rasterized into a PhotoImage covering the part of the
+	#   window they fall in, so recoloring or adding points re-renders that
+	#   image, and moving it is a single canvas move unless markers were
+	#   clipped by the window edge.
+
+	__slots__ = ("coords", "size", "image", "clipped")
+	_aliases = {"outline": "fill"}
+
+	def __init__(self, points, size = 3):
+		GraphicsObject.__init__(self, ["fill"], {"fill": DEFAULT_CONFIG['outline']})
+		self.coords = array.array('d', _flatten(points))
+		self.size = size
+		self.image = None
+		self.clipped = False
+
+	def __len__(self):
+		return len(self.coords) // 2
+
+	def clone(self):
+		return self._shareConfig(PointCloud(self.coords, self.size))
+
+	def getPoints(self):
+		coords = self.coords
+		return [Point(coords[i], coords[i + 1]) for i in range(0, len(coords), 2)]
+
+	def setSize(self, size):
+		"""Sets the side length of the markers, in pixels"""
+		self.size = size
+		self._refresh()
+
+	def append(self, x, y = None):
+		"""Adds a marker at (x, y), or at a Point"""
+		if y is None:
+			x, y = x.x, x.y
+		self.extend((x, y))
+
+	def extend(self, points):
+		"""Adds markers at Points, or at a flat sequence of coordinates"""
+		self.coords.extend(_flatten(points))
+		self._refresh()
+
+	def _reconfig(self, option, setting):
+		# images have no fill option, so changes are rendered into the image instead
+		if option not in self.config:
+			raise GraphicsError(UNSUPPORTED_METHOD)
+		if self._sharedConfig:
+			self.config = self.config.copy()
+			self._sharedConfig = False
+		self.config[option] = setting
+		self._refresh()
+
+	def _reproject(self, canvas, affine):
+		# the markers keep their size in pixels, so the image is rendered again
+		self._refresh()
+
+	def _refresh(self):
+		canvas = self.canvas
+		if canvas and not canvas.isClosed():
+			if self.id is None:
+				canvas._checkView(self)
+			else:
+				self.image, x, y = self._render(canvas)
+				canvas.itemconfig(self.id, image=self.image)
+				canvas.coords(self.id, x, y)
+				if canvas.save_image:
+					canvas._mirror.undraw(self.id)
+					self._mirrorPoints(canvas, self.id)
+			if canvas._index is not None:
+				canvas._index.update(self)
+			canvas._autoflush()
+
+	def _render(self, canvas):
+		# returns a PhotoImage of the markers and the screen position of its upper-left corner
+		coords = self.coords
+		xs, ys = canvas.toScreen(coords[0::2], coords[1::2])
+		if not canvas.trans:
+			# raw coordinates may be floats, but they index pixels
+			xs, ys = [int(x + 0.5) for x in xs], [int(y + 0.5) for y in ys]
+		size, half = max(int(self.size), 1), int(self.size) // 2
+		width, height = int(canvas.width), int(canvas.height)
+		if len(xs):
+			x1, y1 = max(min(xs) - half, 0), max(min(ys) - half, 0)
+			x2, y2 = min(max(xs) - half + size, width), min(max(ys) - half + size, height)
+			self.clipped = x1 > min(xs) - half or y1 > min(ys) - half or x2 < max(xs) - half + size or y2 < max(ys) - half + size
+		if not len(xs) or x2 <= x1 or y2 <= y1:
+			return canvas._rgbaImage(1, 1, bytearray(4)), 0, 0
+		x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+		w, h = x2 - x1, y2 - y1
+		r, g, b = canvas.winfo_rgb(self.config['fill'])
+		color = bytes(bytearray((r >> 8, g >> 8, b >> 8, 255)))
+		buffer = bytearray(w * h * 4)
+		if HAS_NUMPY:
+			pixels = numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(h, w, 4)
+			xs, ys = numpy.asarray(xs) - half - x1, numpy.asarray(ys) - half - y1
+			for dy in range(size):
+				for dx in range(size):
+					px, py = xs + dx, ys + dy
+					inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+					pixels[py[inside], px[inside]] = numpy.frombuffer(color, dtype=numpy.uint8)
+			del pixels
+		else:
+			for x, y in zip(xs, ys):
+				for py in range(max(y - half - y1, 0), min(y - half - y1 + size, h)):
+					for px in range(max(x - half - x1, 0), min(x - half - x1 + size, w)):
+						i = (py * w + px) * 4
+						buffer[i:i+4] = color
+		return canvas._rgbaImage(w, h, buffer), x1, y1
+
+	def _bounds(self):
+		if not self.coords:
+			return None
+		xs, ys = self.coords[0::2], self.coords[1::2]
+		return (min(xs), min(ys), max(xs), max(ys))
+
+	def _move(self, dx, dy):
+		_shift(self.coords, dx, dy)
+
+	def move(self, dx, dy):
+		if self.clipped:
+			# markers hidden by the window edge may come into view
+			self._move(dx, dy)
+			self._refresh()
+		else:
+			GraphicsObject.move(self, dx, dy)
+
+	def _mirrorPoints(self, canvas, item):
+		xs, ys = canvas.toScreen(self.coords[0::2], self.coords[1::2])
+		canvas._mirror.draw(item, 'point', [(int(x), int(y)) for x, y in zip(xs, ys)], self.config['fill'])
+
+	def _draw(self, canvas, options):
+		self.image, x, y = self._render(canvas)
+		item = canvas.create_image(x, y, image=self.image, anchor=tkinter.NW)
+		if canvas.save_image:
+			self._mirrorPoints(canvas, item)
+		return item
+
+def _flatten(points):
+	'''Internal: returns Points, or a flat sequence of coordinates, as a flat sequence of coordinates'''
+	if len(points) and isinstance(points[0], Point):
+		flat = []
+		for p in points:
+			flat.append(p.x)
+			flat.append(p.y)
+		return flat
+	return points
+
+def _shift(coords, dx, dy):
+	'''Internal: moves the flat array('d') of coordinates coords by dx, dy in place'''
+	if HAS_NUMPY:
+		values = numpy.frombuffer(coords, dtype=float)
+		values[0::2] += dx
+		values[1::2] += dy
+		del values
+	else:
+		for i in range(0, len(coords), 2):
+			coords[i] += dx
+			coords[i + 1] += dy
 
 class Text(GraphicsObject):
+
+	_aliases = {"outline": "fill"}
+	_kind = "text"
+	_cullMode = "draw"
 	
 	def __init__(self, p, text):
-		GraphicsObject.__init__(self, ["justify","fill","text","font"])
+		GraphicsObject.__init__(self, ["justify","fill","text","font"], {"fill": DEFAULT_CONFIG['outline']})
 		self.setText(text)
 		self.anchor = p.clone()
-		self.setFill(DEFAULT_CONFIG['outline'])
-		self.setOutline = self.setFill
 		
 	def _draw(self, canvas, options):
 		p = self.anchor
 		x,y = canvas.toScreen(p.x,p.y)
+		item = canvas.create_text(x,y,options)
 		if canvas.save_image:
-			canvas.drawing_image.text((x, y), self.text, font = None)
-		return canvas.create_text(x,y,options)
+			canvas._mirror.draw(item, 'text', (x, y), self.text, self.getColor('fill'), anchor = 'mm')
+		return item
 		
 	def _move(self, dx, dy):
 		self.anchor.move(dx,dy)
+
+	def _record(self):
+		return (self.anchor.x, self.anchor.y)
+
+	def _screen(self, canvas):
+		return canvas.toScreen(self.anchor.x, self.anchor.y)
 		
 	def clone(self):
-		other = Text(self.anchor, self.config['text'])
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(Text(self.anchor, self.config['text']))
 
 	def setText(self,text):
 		self.text = text
@@ -810,6 +2987,8 @@ class Text(GraphicsObject):
 
 class Entry(GraphicsObject):
 
+	_cullMode = None
+
 	def __init__(self, p, width):
 		global _root
 		GraphicsObject.__init__(self, [])
@@ -822,33 +3001,54 @@ class Entry(GraphicsObject):
 		self.color = "black"
 		self.font = DEFAULT_CONFIG['font']
 		self.entry = None
+		self.frame = None
 
 	def _draw(self, canvas, options):
 		p = self.anchor
 		x,y = canvas.toScreen(p.x,p.y)
-		frm = tkinter.Frame(canvas.master)
-		self.entry = tkinter.Entry(frm,
-							width=self.width,
+		if canvas._entryPool:
+			# widgets left by an undrawn Entry are reconfigured rather than created
+			frm, self.entry = canvas._entryPool.pop()
+			self.entry.config(width=self.width,
 							textvariable=self.text,
 							bg = self.fill,
 							fg = self.color,
 							font=self.font)
-		self.entry.pack()
+		else:
+			frm = tkinter.Frame(canvas.master)
+			self.entry = tkinter.Entry(frm,
+								width=self.width,
+								textvariable=self.text,
+								bg = self.fill,
+								fg = self.color,
+								font=self.font)
+			self.entry.pack()
+		self.frame = frm
 		#self.setFill(self.fill)
 		return canvas.create_window(x,y,window=frm)
 
+	def _detach(self):
+		# the widgets go back to the window's pool (the canvas item showing them is gone)
+		canvas = self.canvas
+		if self.entry is not None and not canvas.isClosed():
+			canvas._entryPool.append((self.frame, self.entry))
+		self.entry = self.frame = None
+		GraphicsObject._detach(self)
+
 	def getText(self):
 		return self.text.get()
 
 	def _move(self, dx, dy):
 		self.anchor.move(dx,dy)
 
+	def _screen(self, canvas):
+		return canvas.toScreen(self.anchor.x, self.anchor.y)
+
 	def getAnchor(self):
 		return self.anchor.clone()
 
 	def clone(self):
-		other = Entry(self.anchor, self.width)
-		other.config = self.config.copy()
+		other = self._shareConfig(Entry(self.anchor, self.width))
 		other.text = tkinter.StringVar()
 		other.text.set(self.text.get())
 		other.fill = self.fill
@@ -892,52 +3092,167 @@ class Entry(GraphicsObject):
 		if self.entry:
 			self.entry.config(fg=color)
 
+class ImageStore(object):
+
+	"""Keeps the PhotoImages of Images alive: drawn ones are reference counted,
+	and undrawn images loaded from files are kept in least recently used order,
+	up to a memory budget in bytes, so that loading the same file again shares
+	its PhotoImage instead of reading it once more"""
+	# Tk stops showing a PhotoImage once Python frees it, so drawn images must be
+	#   held here. Every loaded file stays findable (weakly) while anything uses
+	#   its PhotoImage, whether it is drawn, cached or not.
+
+	def __init__(self, budget = 32 * 1024 * 1024):
+		self.budget = budget
+		self.drawn = {}		# id(photo) -> [photo, number of drawn Images showing it]
+		self.cached = collections.OrderedDict()	# id(photo) -> photo, least recently used first
+		self.files = weakref.WeakValueDictionary()	# (path, modification time) -> photo
+		self.sources = weakref.WeakKeyDictionary()	# photo -> (path, modification time)
+		self.cachedBytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def load(self, filename):
+		"""Returns the PhotoImage of the file, shared with every other Image of it"""
+		try:
+			key = (os.path.abspath(filename), os.path.getmtime(filename))
+		except OSError:
+			return _newPhoto(file=filename) # raises Tk's error for the missing file
+		photo = self.files.get(key)
+		if photo is not None:
+			self.hits += 1
+			if id(photo) in self.cached:
+				self.cached[id(photo)] = self.cached.pop(id(photo))
+			return photo
+		self.misses += 1
+		photo = _newPhoto(file=filename)
+		self.files[key] = photo
+		self.sources[photo] = key
+		return photo
+
+	def acquire(self, photo):
+		"""Holds photo while an Image showing it is drawn"""
+		entry = self.drawn.get(id(photo))
+		if entry:
+			entry[1] += 1
+			return
+		if id(photo) in self.cached:
+			del self.cached[id(photo)]
+			self.cachedBytes -= _photoBytes(photo)
+		self.drawn[id(photo)] = [photo, 1]
+
+	def release(self, photo):
+		"""Lets go of photo once no drawn Image shows it; images of files are then cached"""
+		entry = self.drawn.get(id(photo))
+		if not entry:
+			return
+		entry[1] -= 1
+		if entry[1]:
+			return
+		del self.drawn[id(photo)]
+		if photo in self.sources:
+			self.cached[id(photo)] = photo
+			self.cachedBytes += _photoBytes(photo)
+			self._evict()
+
+	def setBudget(self, budget):
+		"""Sets the memory budget (in bytes) for undrawn images, evicting as needed"""
+		self.budget = budget
+		self._evict()
+
+	def clear(self):
+		"""Drops every undrawn image"""
+		self.evictions += len(self.cached)
+		self.cached.clear()
+		self.cachedBytes = 0
+
+	def stats(self):
+		"""Returns a dictionary of the store's counters and memory use (in bytes)"""
+		return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+			"drawn": len(self.drawn), "drawnBytes": sum(_photoBytes(entry[0]) for entry in self.drawn.values()),
+			"cached": len(self.cached), "cachedBytes": self.cachedBytes, "budget": self.budget}
+
+	def _evict(self):
+		while self.cached and self.cachedBytes > self.budget:
+			key, photo = self.cached.popitem(last = False)
+			self.cachedBytes -= _photoBytes(photo)
+			self.evictions += 1
+
+def _photoBytes(photo):
+	'''Internal: the memory a PhotoImage takes (Tk keeps 4 bytes per pixel)'''
+	return photo.width() * photo.height() * 4
+
 class Image(GraphicsObject):
 
-	idCount = 0
-	imageCache = {} # tkinter photoimages go here to avoid GC while drawn 
+	store = ImageStore() # every Image's PhotoImage is held here while drawn
+	_cullMode = "draw"
 	
 	def __init__(self, p, *pixmap):
 		global root
 		GraphicsObject.__init__(self, [])
 		self.anchor = p.clone()
-		self.imageId = Image.idCount
-		Image.idCount = Image.idCount + 1
+		self.filename = None
 		if len(pixmap) == 1:
 			# file name provided
-			self.img = tkinter.PhotoImage(file=pixmap[0], master=_root)
+			self.filename = pixmap[0]
+			self.img = self.store.load(pixmap[0])
+			self.sharedImg = True
 		else:
 			# width and height provided
 			width, height = pixmap
-			self.img = tkinter.PhotoImage(master=_root, width=width, height=height)
+			self.img = _newPhoto(width=width, height=height)
+			self.sharedImg = False
 				
 	def _draw(self, canvas, options):
 		p = self.anchor
 		x,y = canvas.toScreen(p.x,p.y)
-		self.imageCache[self.imageId] = self.img # save a reference  
-		if canvas.save_image:
-			canvas.drawing_image.bitmap((x, y), self.img)
-		return canvas.create_image(x,y,image=self.img)
+		self.store.acquire(self.img)
+		item = canvas.create_image(x,y,image=self.img)
+		if canvas.save_image and self.filename:
+			# only images loaded from a file can be mirrored off the Tk thread
+			canvas._mirror.draw(item, 'paste', self.filename, (x, y))
+		return item
 	
 	def _move(self, dx, dy):
 		self.anchor.move(dx,dy)
+
+	def _screen(self, canvas):
+		return canvas.toScreen(self.anchor.x, self.anchor.y)
 		
-	def undraw(self):
-		try:
-			del self.imageCache[self.imageId]  # allow gc of tkinter photoimage
-		except KeyError:
-			pass
-		GraphicsObject.undraw(self)
+	def _detach(self):
+		self.store.release(self.img)  # allow gc of tkinter photoimage
+		GraphicsObject._detach(self)
+
+	def _itemDeleted(self):
+		self.store.release(self.img)
+
+	def _own(self):
+		# Internal method: before changing pixels, an Image sharing its PhotoImage
+		#    (with other Images of the same file, or with clones) takes a copy
+		if not self.sharedImg:
+			return
+		img = self.img.copy()
+		canvas = self.canvas
+		if canvas and not canvas.isClosed():
+			self.store.acquire(img)
+			canvas.itemconfig(self.id, image=img)
+			self.store.release(self.img)
+		self.img = img
+		self.sharedImg = False
+		self.filename = None
 
 	def getAnchor(self):
 		return self.anchor.clone()
 		
 	def clone(self):
+		# the clone shares the PhotoImage until either of them changes its pixels
 		other = Image(Point(0,0), 0, 0)
-		other.img = self.img.copy()
+		other.img = self.img
+		other.filename = self.filename
+		other.sharedImg = self.sharedImg = True
 		other.anchor = self.anchor.clone()
-		other.config = self.config.copy()
-		return other
+		return self._shareConfig(other)
 
 	def getWidth(self):
 		"""Returns the width of the image in pixels"""
@@ -955,12 +3270,68 @@ class Image(GraphicsObject):
 		value = self.img.get(x,y) 
 		if type(value) ==  type(0):
 			return [value, value, value]
-		else:
+		elif isinstance(value, str):
 			return list(map(int, value.split())) 
+		else:
+			return list(map(int, value))
 
 	def setPixel(self, x, y, color):
 		"""Sets pixel (x,y) to the given color"""
+		self._own()
 		self.img.put("{" + color +"}", (x, y))
+
+	def getRegion(self, x = 0, y = 0, width = None, height = None):
+		"""Returns the RGB values of the width x height block of pixels whose
+		upper-left corner is (x, y) -- by default, the whole image -- in one
+		operation: a height x width x 3 NumPy array of uint8 or, without NumPy,
+		bytes holding r, g, b for each pixel, row by row
+
+		"""
+		if width is None:
+			width = self.getWidth() - x
+		if height is None:
+			height = self.getHeight() - y
+		if isinstance(self.img, _PILPhoto):
+			data = self.img.image.crop((x, y, x + width, y + height)).convert("RGB").tobytes()
+		else:
+			# a single Tcl call returning every pixel as #rrggbb
+			colors = self.img.tk.call(self.img.name, 'data', '-from', x, y, x + width, y + height)
+			if not isinstance(colors, str):
+				colors = " ".join(map(str, tkinter._flatten((colors,))))
+			data = binascii.unhexlify(_NOT_HEX.sub("", colors))
+		if HAS_NUMPY:
+			return numpy.frombuffer(bytearray(data), dtype=numpy.uint8).reshape(height, width, 3)
+		return data
+
+	def setRegion(self, x, y, pixels, width = None):
+		"""Sets the block of pixels whose upper-left corner is (x, y) in one
+		operation. pixels is a height x width x 3 (RGB) or height x width x 4
+		(RGBA) array, or bytes of r, g, b values row by row (as returned by
+		getRegion without NumPy), in which case width is the width of the block
+
+		"""
+		if isinstance(pixels, (bytes, bytearray, memoryview)):
+			if not width:
+				raise GraphicsError("setRegion needs the width of the block")
+			data, channels = bytes(pixels), 3
+			height = len(data) // (width * 3)
+		else:
+			if not HAS_NUMPY:
+				raise GraphicsError("setRegion needs NumPy for arrays; pass bytes and a width instead")
+			pixels = numpy.ascontiguousarray(pixels, dtype=numpy.uint8)
+			if pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+				raise GraphicsError(BAD_OPTION)
+			height, width, channels = pixels.shape
+			data = pixels.tobytes()
+		if not width or not height:
+			return
+		self._own()
+		if isinstance(self.img, _PILPhoto):
+			self.img.image.paste(PILImage.frombytes("RGBA" if channels == 4 else "RGB", (width, height), data), (x, y))
+		else:
+			stride = width * channels
+			rows = [data[i * stride:(i + 1) * stride] for i in range(height)]
+			self.img.tk.call(self.img.name, 'put', _encodePNG(width, height, rows, channels), '-format', 'png', '-to', x, y)
 		
 	def save(self, filename):
 		"""Saves the pixmap image to filename.
@@ -971,6 +3342,775 @@ class Image(GraphicsObject):
 		self.img.write( filename, format=ext)
 
 		
+class TiledImage(GraphicsObject):
+
+	"""An image too large for a single PhotoImage, stretched over the rectangle with
+	upper-left corner p1 and lower-right corner p2 and shown in tiles: only the tiles
+	in the window's view are decoded, at the resolution the view needs. Requires PIL.
+	filename may be any image PIL reads or a NumPy .npy array (height x width x 3 or 4,
+	or height x width of gray levels) which is memory-mapped rather than loaded"""
+	# Tiles are tileSize pixels square at some level of detail, level n sampling
+	#   every 2**n-th pixel of the image. Decoded tiles (already scaled to their
+	#   size on screen) live in an LRU cache of cacheSize tiles. Each time the
+	#   view changes, the visible tiles are laid out (decoding any that are
+	#   missing) and the ring of tiles around them is queued for a background
+	#   thread to decode, so that panning finds them ready. All the canvas items
+	#   share the tag that serves as the object's id.
+
+	count = 0
+	_cullMode = None # it lays its tiles out itself
+
+	def __init__(self, p1, p2, filename, tileSize = 256, cacheSize = 64):
+		if not HAS_PIL:
+			raise GraphicsError("TiledImage requires the Python Imaging Library (PIL)")
+		GraphicsObject.__init__(self, [])
+		self.p1 = p1.clone()
+		self.p2 = p2.clone()
+		if filename.lower().endswith(".npy"):
+			self.source = _ArrayTiles(filename)
+		else:
+			self.source = _PILTiles(filename)
+		self.tileSize = tileSize
+		self.cacheSize = cacheSize
+		TiledImage.count += 1
+		self.tag = "tiled%d" % TiledImage.count
+		self.tiles = collections.OrderedDict()	# (level, column, row, width, height) -> PIL image
+		self.lock = threading.Lock()
+		self.items = {}		# key of a shown tile -> (canvas item, photo, x, y)
+		self.jobs = None
+		self.generation = 0
+
+	def getWidth(self):
+		"""Returns the width of the full image in pixels"""
+		return self.source.size[0]
+
+	def getHeight(self):
+		"""Returns the height of the full image in pixels"""
+		return self.source.size[1]
+
+	def getP1(self): return self.p1.clone()
+
+	def getP2(self): return self.p2.clone()
+
+	def _bounds(self):
+		p1, p2 = self.p1, self.p2
+		return (min(p1.x, p2.x), min(p1.y, p2.y), max(p1.x, p2.x), max(p1.y, p2.y))
+
+	def _move(self, dx, dy):
+		for p in (self.p1, self.p2):
+			p.x = p.x + dx
+			p.y = p.y + dy
+
+	def move(self, dx, dy):
+		# parts of the image may come into view, so the tiles are laid out again
+		self._move(dx, dy)
+		canvas = self.canvas
+		if canvas and not canvas.isClosed():
+			self._layout(canvas)
+			if canvas._index is not None:
+				canvas._index.update(self)
+			canvas._autoflush()
+
+	def _draw(self, canvas, options):
+		canvas._viewers.append(self)
+		self._layout(canvas)
+		return self.tag
+
+	def _detach(self):
+		canvas = self.canvas
+		if self in canvas._viewers:
+			canvas._viewers.remove(self)
+		self.items = {}
+		self.generation += 1 # so the prefetch thread skips what is left queued
+		if self.jobs:
+			self.jobs.put(None)
+			self.jobs = None
+		self.source.release()
+		GraphicsObject._detach(self)
+
+	def _viewChanged(self):
+		# called by the window when its coordinates change
+		self._layout(self.canvas)
+
+	def _reproject(self, canvas, affine):
+		pass # already laid out by _viewChanged
+
+	def _layout(self, canvas):
+		# shows the tiles in view, reusing the canvas items of tiles still shown
+		self.generation += 1
+		visible, ring = self._tilesInView(canvas)
+		items = {}
+		for key, (x, y) in visible.items():
+			if key in self.items:
+				item, photo, oldX, oldY = self.items.pop(key)
+				if (oldX, oldY) != (x, y):
+					canvas.coords(item, x, y)
+			else:
+				tile = self._tile(key)
+				photo = canvas._rgbaImage(tile.size[0], tile.size[1], tile.tobytes())
+				item = canvas.create_image(x, y, image=photo, anchor=tkinter.NW, tags=(self.tag,) + _groupTags(self))
+				shown = list(items.values()) or list(self.items.values())
+				if shown:
+					# keeps the image's place in the stacking order
+					canvas.tag_lower(item, shown[0][0])
+			items[key] = (item, photo, x, y)
+		for item, photo, x, y in self.items.values():
+			canvas.delete(item)
+		self.items = items
+		self._prefetch(ring)
+
+	def _tilesInView(self, canvas):
+		# returns {key: screen position} for the tiles in view, and the same for the ring around them
+		width, height = self.source.size
+		x1, y1 = canvas.toScreen(self.p1.x, self.p1.y)
+		x2, y2 = canvas.toScreen(self.p2.x, self.p2.y)
+		x1, x2, y1, y2 = min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)
+		vx1, vy1, vx2, vy2 = max(x1, 0), max(y1, 0), min(x2, int(canvas.width)), min(y2, int(canvas.height))
+		if vx2 <= vx1 or vy2 <= vy1:
+			return {}, {}
+		xscale, yscale = (x2 - x1) / float(width), (y2 - y1) / float(height)
+		ratio = min(1 / xscale, 1 / yscale)
+		level = max(int(math.floor(math.log(ratio, 2))), 0) if ratio > 1 else 0
+		span = self.tileSize << level
+		columns = (int(width + span - 1) // span, int(height + span - 1) // span)
+		first = (int((vx1 - x1) / xscale) // span, int((vy1 - y1) / yscale) // span)
+		last = (min(int((vx2 - x1) / xscale) // span, columns[0] - 1), min(int((vy2 - y1) / yscale) // span, columns[1] - 1))
+		visible, ring = {}, {}
+		for row in range(first[1] - 1, last[1] + 2):
+			for column in range(first[0] - 1, last[0] + 2):
+				if 0 <= column < columns[0] and 0 <= row < columns[1]:
+					left, top = int(round(x1 + column * span * xscale)), int(round(y1 + row * span * yscale))
+					right = int(round(x1 + min((column + 1) * span, width) * xscale))
+					bottom = int(round(y1 + min((row + 1) * span, height) * yscale))
+					if right > left and bottom > top:
+						key = (level, column, row, right - left, bottom - top)
+						inside = first[0] <= column <= last[0] and first[1] <= row <= last[1]
+						(visible if inside else ring)[key] = (left, top)
+		return visible, ring
+
+	def _tile(self, key):
+		with self.lock:
+			tile = self.tiles.get(key)
+			if tile is not None:
+				self.tiles[key] = self.tiles.pop(key)
+				return tile
+		return self._store(key, self._decode(key))
+
+	def _decode(self, key):
+		level, column, row, width, height = key
+		span = self.tileSize << level
+		box = (column * span, row * span, min((column + 1) * span, self.source.size[0]), min((row + 1) * span, self.source.size[1]))
+		return self.source.region(box, level).convert("RGBA").resize((width, height))
+
+	def _store(self, key, tile):
+		with self.lock:
+			self.tiles[key] = tile
+			while len(self.tiles) > self.cacheSize:
+				self.tiles.popitem(last = False)
+		return tile
+
+	def _prefetch(self, keys):
+		if not keys:
+			return
+		if self.jobs is None:
+			self.jobs = queue.Queue()
+			worker = threading.Thread(target = self._prefetchTiles, args = (self.jobs,))
+			worker.daemon = True
+			worker.start()
+		for key in keys:
+			self.jobs.put((self.generation, key))
+
+	def _prefetchTiles(self, jobs):
+		# runs on the prefetch thread; only PIL work happens here, never Tk calls
+		while True:
+			job = jobs.get()
+			if job is None:
+				return
+			generation, key = job
+			if generation != self.generation:
+				continue # the view has moved on
+			with self.lock:
+				cached = key in self.tiles
+			if not cached:
+				self._store(key, self._decode(key))
+
+_openLock = threading.Lock()
+
+def _openLarge(filename):
+	'''Internal: opens an image file with PIL however many pixels it has. PIL refuses
+	files over PILImage.MAX_IMAGE_PIXELS as possible decompression bombs, but a
+	TiledImage is meant for such files and never keeps them decoded in memory'''
+	with _openLock:
+		limit = PILImage.MAX_IMAGE_PIXELS
+		PILImage.MAX_IMAGE_PIXELS = None
+		try:
+			return PILImage.open(filename)
+		finally:
+			PILImage.MAX_IMAGE_PIXELS = limit
+
+class _PILTiles:
+
+	"""Internal class for the tiles of an image file read with PIL. For the first tile
+	the file is decoded once into a temporary file of RGBA pixels, which is then
+	memory-mapped: a tile samples only its own pixels, and the mapping is dropped
+	when the image is undrawn"""
+
+	def __init__(self, filename):
+		self.filename = filename
+		self.size = _openLarge(filename).size
+		self.path = None	# the temporary file of pixels, once converted
+		self.image = None	# a PIL image over the mapped pixels
+		self.lock = threading.Lock()
+
+	def region(self, box, level):
+		with self.lock:
+			if self.image is None:
+				self.image = self._map()
+			image = self.image
+		step = 1 << level
+		size = ((box[2] - box[0] + step - 1) // step, (box[3] - box[1] + step - 1) // step)
+		return image.resize(size, PILImage.NEAREST, box)
+
+	def release(self):
+		with self.lock:
+			self.image = None
+
+	def _map(self):
+		if self.path is None:
+			self.path = self._convert()
+		with open(self.path, "rb") as data:
+			pixels = mmap.mmap(data.fileno(), 0, access = mmap.ACCESS_READ)
+		return PILImage.frombuffer("RGBA", self.size, pixels, "raw", "RGBA", 0, 1)
+
+	def _convert(self):
+		# PIL decodes most formats whole, so this is the only full decode, and
+		#   only a band of it is converted to RGBA at a time (a band small
+		#   enough for PIL's pixel limit, which crop checks too)
+		image = _openLarge(self.filename)
+		width, height = self.size
+		rows = _TILE_BAND
+		if PILImage.MAX_IMAGE_PIXELS:
+			rows = max(min(rows, PILImage.MAX_IMAGE_PIXELS // width), 1)
+		handle, path = tempfile.mkstemp(suffix = ".rgba")
+		try:
+			with os.fdopen(handle, "wb") as data:
+				for top in range(0, height, rows):
+					band = image.crop((0, top, width, min(top + rows, height)))
+					data.write(band.convert("RGBA").tobytes())
+		except:
+			os.remove(path)
+			raise
+		return path
+
+	def __del__(self):
+		if self.path:
+			try:
+				os.remove(self.path)
+			except OSError:
+				pass
+
+class _ArrayTiles:
+
+	"""Internal class for the tiles of a memory-mapped NumPy array: a tile reads only the
+	rows and columns it samples"""
+
+	def __init__(self, filename):
+		if not HAS_NUMPY:
+			raise GraphicsError("TiledImage needs NumPy for .npy files")
+		self.filename = filename
+		self.array = numpy.load(filename, mmap_mode = "r")
+		self.size = (self.array.shape[1], self.array.shape[0])
+
+	def region(self, box, level):
+		array = self.array
+		if array is None:
+			array = self.array = numpy.load(self.filename, mmap_mode = "r")
+		step = 1 << level
+		block = numpy.ascontiguousarray(array[box[1]:box[3]:step, box[0]:box[2]:step])
+		return PILImage.fromarray(block.astype(numpy.uint8))
+
+	def release(self):
+		self.array = None
+
+class GraphicsGroup(object):
+
+	"""A set of GraphicsObjects sharing a canvas tag, so that the whole group is
+	moved, restyled, raised, lowered or undrawn with a single canvas command"""
+	# Besides the group tag, every plain member (one whose canvas item is moved
+	#   and configured directly) carries a tag for its kind (the set of options
+	#   it supports), since e.g. a Line takes "fill" where a Rectangle takes
+	#   "outline" and Tk rejects options an item lacks. Members that move or
+	#   restyle themselves (PointClouds, TiledImages, Entries) have only the
+	#   group tag and are moved and restyled through their own methods.
+
+	count = 0
+
+	def __init__(self, *items):
+		if len(items) == 1 and type(items[0]) == type([]):
+			items = items[0]
+		GraphicsGroup.count += 1
+		self.tag = "group%d" % GraphicsGroup.count
+		self.items = []
+		self.kinds = {}
+		self.add(*items)
+
+	def __len__(self):
+		return len(self.items)
+
+	def __iter__(self):
+		return iter(self.items)
+
+	def add(self, *items):
+		"""Adds items to the group; drawn items are tagged right away, others when they are drawn"""
+		for item in items:
+			self.items.append(item)
+			_memberships.setdefault(item, weakref.WeakSet()).add(self)
+			if item.canvas and not item.canvas.isClosed():
+				self._tag(item)
+
+	def remove(self, *items):
+		"""Removes items from the group, leaving them drawn"""
+		for item in items:
+			self.items.remove(item)
+			if item in self.items:
+				continue
+			_memberships.get(item, set()).discard(self)
+			if item.canvas and not item.canvas.isClosed():
+				tags = self._tags(item)
+				if item.id is None:
+					culling = item.canvas._culling
+					if culling is not None:
+						culling[item] = tuple(tag for tag in culling[item] if tag not in tags)
+				else:
+					for tag in tags:
+						item.canvas.dtag(item.id, tag)
+
+	def _kindTag(self, item):
+		key = (tuple(sorted(item.config)), tuple(sorted(item._aliases.items())))
+		kind = self.kinds.get(key)
+		if kind is None:
+			kind = self.kinds[key] = ("%s-%d" % (self.tag, len(self.kinds)), key[0], dict(key[1]))
+		return kind[0]
+
+	def _tags(self, item):
+		if _isPlain(item):
+			return (self.tag, self._kindTag(item))
+		return (self.tag,)
+
+	def _tag(self, item):
+		tags = self._tags(item)
+		if item.id is None:
+			# culled, or without points yet: the tags are added when its item is drawn
+			if item.canvas._culling is not None:
+				item.canvas._culling[item] += tags
+		else:
+			for tag in tags:
+				item.canvas.addtag_withtag(tag, item.id)
+
+	def _canvases(self):
+		return set([item.canvas for item in self.items if item.canvas and not item.canvas.isClosed()])
+
+	def draw(self, graphwin):
+		"""Draws every member not yet drawn into graphwin, with a single flush"""
+		with graphwin._bulk():
+			for item in self.items:
+				if not item.canvas:
+					item.draw(graphwin)
+
+	def undraw(self):
+		"""Undraws every member with one canvas command per window"""
+		canvases = self._canvases()
+		for canvas in canvases:
+			canvas.delete(self.tag)
+		for item in self.items:
+			if item.canvas:
+				if item.canvas.save_image and item.id is not None:
+					item.canvas._mirror.undraw(item.id)
+				item._detach()
+		for canvas in canvases:
+			canvas._autoflush()
+
+	def move(self, dx, dy):
+		"""Moves every member dx units in the x direction and dy units in the y direction"""
+		canvases = self._canvases()
+		for canvas in canvases:
+			canvas.begin()
+		try:
+			plain = []
+			for item in self.items:
+				if _isPlain(item):
+					item._move(dx, dy)
+					plain.append(item)
+				else:
+					item.move(dx, dy)
+			for canvas in canvases:
+				trans = canvas.trans
+				x, y = (dx / trans.xscale, -dy / trans.yscale) if trans else (dx, dy)
+				for tag, options, aliases in self.kinds.values():
+					canvas.move(tag, x, y)
+				for item in plain:
+					if item.canvas is canvas:
+						if canvas.save_image and item.id is not None:
+							canvas._mirror.move(item.id, x, y)
+						if canvas._culling is not None:
+							canvas._checkView(item)
+						if canvas._index is not None:
+							canvas._index.update(item)
+						if canvas._recording is not None:
+							canvas._recording.move(item, dx, dy)
+		finally:
+			for canvas in canvases:
+				canvas._endBatch(canvas.autoflush)
+
+	def setFill(self, color):
+		"""Sets the interior color of every member that has one"""
+		self._reconfig("fill", color)
+
+	def setOutline(self, color):
+		"""Sets the outline color of every member that has one"""
+		self._reconfig("outline", color)
+
+	def setWidth(self, width):
+		"""Sets the line weight of every member that has one"""
+		self._reconfig("width", width)
+
+	def _reconfig(self, option, setting):
+		# applies the option to each kind of plain member with one itemconfig per kind
+		setter = "set" + option.capitalize()
+		for item in self.items:
+			target = item._aliases.get(option, option)
+			if not _isPlain(item):
+				if target in item.config or _overrides(type(item), setter):
+					getattr(item, setter)(setting)
+			elif target in item.config:
+				if item._sharedConfig:
+					item.config = item.config.copy()
+					item._sharedConfig = False
+				item.config[target] = setting
+				if item.canvas and item.canvas._recording is not None:
+					item.canvas._recording.configure(item, item.config)
+		canvases = self._canvases()
+		for tag, options, aliases in self.kinds.values():
+			target = aliases.get(option, option)
+			if target in options:
+				for canvas in canvases:
+					canvas.itemconfig(tag, {target: setting})
+		for canvas in canvases:
+			canvas._autoflush()
+
+	def lift(self):
+		"""Raises the group above all other canvas items"""
+		self._restack(True)
+		for canvas in self._canvases():
+			canvas.tag_raise(self.tag)
+			canvas._autoflush()
+
+	def lower(self):
+		"""Lowers the group below all other canvas items"""
+		self._restack(False)
+		for canvas in self._canvases():
+			canvas.tag_lower(self.tag)
+			canvas._autoflush()
+
+	def _restack(self, top):
+		# keeps the stacking order of recording windows' display lists in step
+		items = self.items if top else reversed(self.items)
+		for item in items:
+			if item.canvas and item.canvas._recording is not None:
+				item.canvas._recording.restack(item, top)
+
+def _overrides(cls, *names):
+	'''Internal: whether a GraphicsObject subclass defines any of the methods names itself'''
+	for klass in cls.__mro__:
+		if klass is GraphicsObject:
+			return False
+		for name in names:
+			if name in vars(klass):
+				return True
+	return False
+
+_PLAIN = {} # GraphicsObject subclass -> whether a group moves and restyles its canvas items directly
+
+def _isPlain(item):
+	'''Internal: whether the canvas item of a group member is moved and configured directly, rather than
+	through the member's own move and setters'''
+	cls = type(item)
+	plain = _PLAIN.get(cls)
+	if plain is None:
+		plain = _PLAIN[cls] = not _overrides(cls, "move", "_reconfig", "setFill", "setOutline", "setWidth")
+	return plain
+
+def _groupTags(item):
+	'''Internal: the canvas tags of every group an object belongs to'''
+	tags = ()
+	for group in _memberships.get(item, ()):
+		tags += group._tags(item)
+	return tags
+
+class DisplayList(object):
+
+	"""A compact record of drawing commands (the kind of item, its coordinates and its
+	configuration) that can be replayed onto any GraphWin, or saved and loaded in a binary format"""
+	# Entries are kept in stacking order and keyed by the object that drew them (or,
+	#   for replayed commands, their canvas item), so a recording window can follow
+	#   undraw, move and reconfiguration.
+	#   Coordinates are array('d')s in world coordinates ("pixels" entries are in
+	#   screen coordinates) and identical configurations are stored once.
+	#   Runs of plotted pixels of one color are merged into a single entry.
+
+	KINDS = ("point", "rectangle", "oval", "line", "polygon", "polyline", "text", "plot", "pixels")
+	MAGIC = b"GWDL"
+	VERSION = 1
+
+	def __init__(self):
+		self.entries = collections.OrderedDict()
+		self._configs = {}
+		self._last = None
+		self._count = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __iter__(self):
+		"""Iterates over the commands as (kind, coords, config) tuples"""
+		for kind, coords, config in self.entries.values():
+			yield kind, coords, config
+
+	def add(self, kind, coords, config, key = None):
+		"""Appends a command and returns its key: kind is one of DisplayList.KINDS, coords a flat
+		sequence of coordinates x1, y1, x2, y2, ... and config the item's options"""
+		if kind not in self.KINDS:
+			raise GraphicsError(BAD_OPTION)
+		config = self._intern(config)
+		if key is None:
+			last = self.entries.get(self._last)
+			if last and last[0] == kind and last[2] is config and kind in ("plot", "pixels"):
+				last[1].extend(coords)
+				return self._last
+			self._count += 1
+			key = ("anonymous", self._count)
+		self.entries[key] = [kind, array.array('d', coords), config]
+		self._last = key
+		return key
+
+	def remove(self, key):
+		self.entries.pop(key, None)
+
+	def move(self, key, dx, dy):
+		entry = self.entries.get(key)
+		if entry:
+			_shift(entry[1], dx, dy)
+
+	def extend(self, key, coords):
+		entry = self.entries.get(key)
+		if entry:
+			entry[1].extend(coords)
+
+	def configure(self, key, config):
+		entry = self.entries.get(key)
+		if entry:
+			entry[2] = self._intern(config)
+
+	def restack(self, key, top = True):
+		"""Moves the command to the top (or bottom) of the stacking order"""
+		if key in self.entries:
+			entry = self.entries.pop(key)
+			if top:
+				self.entries[key] = entry
+			else:
+				self.entries = collections.OrderedDict([(key, entry)] + list(self.entries.items()))
+
+	def clear(self):
+		self.entries.clear()
+		self._configs.clear()
+		self._last = None
+
+	def copy(self):
+		"""Returns an independent copy of the display list"""
+		other = DisplayList()
+		for kind, coords, config in self:
+			other.add(kind, coords, config)
+		return other
+
+	def _intern(self, config):
+		key = tuple(sorted(config.items()))
+		shared = self._configs.get(key)
+		if shared is None:
+			shared = self._configs[key] = dict(config)
+		return shared
+
+	def replay(self, graphwin):
+		"""Draws every command onto graphwin (in its current coordinates) with a single flush,
+		without creating any GraphicsObjects"""
+		if graphwin.isClosed():
+			raise GraphicsError("Can't draw to closed window")
+		with graphwin.batch():
+			for kind, coords, config in list(self):
+				_replayCommand(graphwin, kind, coords, config)
+
+	def toBytes(self):
+		"""Returns the display list in its binary format"""
+		configs, chunks = {}, []
+		for kind, coords, config in self:
+			index = configs.setdefault(id(config), (len(configs), config))[0]
+			values = array.array('d', coords)
+			if sys.byteorder == "big":
+				values.byteswap()
+			chunks.append(struct.pack("<BII", self.KINDS.index(kind), index, len(values)) + _arrayBytes(values))
+		header = [self.MAGIC, struct.pack("<HI", self.VERSION, len(configs))]
+		for index, config in sorted(configs.values(), key = lambda pair: pair[0]):
+			header.append(_packValue(tuple(sorted(config.items()))))
+		header.append(struct.pack("<I", len(chunks)))
+		return b"".join(header + chunks)
+
+	@classmethod
+	def fromBytes(cls, data):
+		"""Returns the display list stored in data, as produced by toBytes"""
+		if data[:4] != cls.MAGIC:
+			raise GraphicsError("not a display list")
+		version, count = struct.unpack_from("<HI", data, 4)
+		if version > cls.VERSION:
+			raise GraphicsError("unsupported display list version %d" % version)
+		offset, configs = 10, []
+		for i in range(count):
+			pairs, offset = _unpackValue(data, offset)
+			configs.append(dict(pairs))
+		count, = struct.unpack_from("<I", data, offset)
+		offset += 4
+		displayList = cls()
+		for i in range(count):
+			kind, index, length = struct.unpack_from("<BII", data, offset)
+			offset += 9
+			values = _arrayFromBytes('d', data[offset:offset + 8 * length])
+			if sys.byteorder == "big":
+				values.byteswap()
+			offset += 8 * length
+			displayList.add(cls.KINDS[kind], values, configs[index])
+		return displayList
+
+	def save(self, filepath):
+		"""Saves the display list to filepath"""
+		with open(filepath, "wb") as f:
+			f.write(self.toBytes())
+
+	@classmethod
+	def load(cls, filepath):
+		"""Returns the display list saved in filepath"""
+		with open(filepath, "rb") as f:
+			return cls.fromBytes(f.read())
+
+def _packValue(value):
+	'''Internal: serializes a configuration value (a string, number, None or tuple of those)'''
+	if value is None:
+		return b"n"
+	if isinstance(value, bool):
+		return struct.pack("<cB", b"b", value)
+	if isinstance(value, int):
+		return struct.pack("<cq", b"i", value)
+	if isinstance(value, float):
+		return struct.pack("<cd", b"f", value)
+	if isinstance(value, (tuple, list)):
+		return struct.pack("<cI", b"t", len(value)) + b"".join(_packValue(item) for item in value)
+	data = (value if isinstance(value, type(u"")) else str(value)).encode("utf-8")
+	return struct.pack("<cI", b"s", len(data)) + data
+
+def _arrayBytes(values):
+	'''Internal: the machine bytes of an array (array.tostring before Python 3.2)'''
+	return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+def _arrayFromBytes(typecode, data):
+	'''Internal: an array of the given type read from its machine bytes (array.fromstring before Python 3.2)'''
+	values = array.array(typecode)
+	if hasattr(values, "frombytes"):
+		values.frombytes(data)
+	else:
+		values.fromstring(data)
+	return values
+
+def _unpackValue(data, offset):
+	'''Internal: reads a value written by _packValue; returns it with the offset just past it'''
+	tag = data[offset:offset + 1]
+	offset += 1
+	if tag == b"n":
+		return None, offset
+	if tag == b"b":
+		return bool(struct.unpack_from("<B", data, offset)[0]), offset + 1
+	if tag == b"i":
+		return struct.unpack_from("<q", data, offset)[0], offset + 8
+	if tag == b"f":
+		return struct.unpack_from("<d", data, offset)[0], offset + 8
+	length, = struct.unpack_from("<I", data, offset)
+	offset += 4
+	if tag == b"t":
+		items = []
+		for i in range(length):
+			item, offset = _unpackValue(data, offset)
+			items.append(item)
+		return tuple(items), offset
+	if tag == b"s":
+		return data[offset:offset + length].decode("utf-8"), offset + length
+	raise GraphicsError("corrupt display list")
+
+def _replayCommand(canvas, kind, coords, config):
+	'''Internal: draws one display list command onto canvas, recording it if the canvas records'''
+	if kind == "plot":
+		canvas.plotMany(coords[0::2], coords[1::2], config["fill"])
+		return
+	if kind == "pixels":
+		canvas.plotPixels(coords[0::2], coords[1::2], config["fill"])
+		return
+	if not len(coords):
+		return # a Polyline recorded before it had points
+	xs, ys = canvas.toScreen(coords[0::2], coords[1::2])
+	screen = _interleave(xs, ys)
+	if kind == "point":
+		x, y = screen
+		item = canvas.create_rectangle(x, y, x + 1, y + 1, config)
+	elif kind == "rectangle":
+		item = canvas.create_rectangle(screen, config)
+	elif kind == "oval":
+		item = canvas.create_oval(screen, config)
+	elif kind == "polygon":
+		item = canvas.create_polygon(screen, config)
+	elif kind == "text":
+		item = canvas.create_text(screen, config)
+	else:
+		item = canvas.create_line(screen * 2 if len(screen) == 2 else screen, config)
+	if canvas._recording is not None:
+		canvas._recording.add(kind, coords, config, item)
+	if canvas.save_image:
+		method, args, kwargs = _mirrorCommand(kind, screen, config)
+		if method:
+			canvas._mirror.draw(item, method, *args, **kwargs)
+
+def _mirrorCommand(kind, screen, config):
+	'''Internal: the save_image mirror command for a replayed item, as (method, args, kwargs)'''
+	fill, outline = config.get("fill"), config.get("outline") or "black"
+	if kind == "point":
+		return "point", (tuple(screen), outline), {}
+	if kind in ("rectangle", "oval"):
+		x1, y1, x2, y2 = screen
+		box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+		return ("rectangle" if kind == "rectangle" else "ellipse"), (box, fill or (0, 0, 0, 0), outline), {}
+	if kind == "polygon":
+		points = list(zip(screen[0::2], screen[1::2]))
+		if len(points) > 2:
+			return "polygon", (points, fill or (0, 0, 0, 0), outline), {}
+		return None, (), {}
+	if kind == "text":
+		return "text", (tuple(screen), config.get("text", ""), fill or "black"), {"anchor": "mm"}
+	if kind == "polyline":
+		return "line", (screen, fill or "black", int(float(config.get("width", 1)))), {}
+	return "line", (screen, fill or "black"), {}
+
+def _interleave(xs, ys):
+	'''Internal: returns the coordinates xs and ys as a flat list x1, y1, x2, y2, ...'''
+	if HAS_NUMPY:
+		return numpy.column_stack((xs, ys)).ravel().tolist()
+	flat = [0] * (len(xs) * 2)
+	flat[0::2], flat[1::2] = xs, ys
+	return flat
+
 def color_rgb(r,g,b):
 	"""r,g,b are intensities of red, green, and blue in range(256)
 	Returns color specifier string for the resulting color"""
@@ -980,18 +4120,25 @@ def drawAll(window, *itemsToDraw):
 	"""Draw all items to a window"""
 	if not isinstance(window, GraphWin):
 		raise TypeError('Window must be a GraphWin object')
-	for item in itemsToDraw: item.draw(window)
+	with window._bulk():
+		for item in itemsToDraw: item.draw(window)
 
 def undrawAll(*itemsToUndraw):
 	"""Undraws all items from a window"""
-	for item in itemsToUndraw: item.undraw()
+	canvases = set([item.canvas for item in itemsToUndraw if item.canvas and not item.canvas.isClosed()])
+	for canvas in canvases: canvas.begin()
+	try:
+		for item in itemsToUndraw: item.undraw()
+	finally:
+		for canvas in canvases: canvas._endBatch(canvas.autoflush)
 
 def redrawAll(window, *itemsToRedraw):
 	"""Redraws all items to a window"""
 	if not isinstance(window, GraphWin):
 		raise TypeError('Window must be a GraphWin object')
-	undrawAll(*itemsToRedraw)
-	drawAll(window, *itemsToRedraw)
+	with window._bulk():
+		undrawAll(*itemsToRedraw)
+		drawAll(window, *itemsToRedraw)
 
 def test():
 	win = GraphWin(tkinter.Tk())
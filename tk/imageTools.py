@@ -0,0 +1,215 @@
+# tk/imageTools.py
+# Rushy Panchal
+# v1.0
+
+'''Provides vectorized image operations (grayscale, threshold, convolution, resizing and color maps)
+on graphics.Image, chained into pipelines that read and write the image's pixels once
+
+	pipeline = Pipeline().grayscale().convolve(SHARPEN).threshold(100)
+	pipeline.apply(image)
+
+Requires NumPy'''
+
+from __future__ import division
+import multiprocessing
+from tk.graphics import Image, GraphicsError, BAD_OPTION
+try:
+	import numpy
+	HAS_NUMPY = True
+except ImportError:
+	HAS_NUMPY = False
+try:
+	from PIL import ImageColor
+	HAS_PIL = True
+except ImportError:
+	HAS_PIL = False
+
+### Constants
+
+# Convolution kernels
+BOX_BLUR = [[1 / 9] * 3 for row in range(3)]
+GAUSSIAN_BLUR = [[1 / 16, 2 / 16, 1 / 16], [2 / 16, 4 / 16, 2 / 16], [1 / 16, 2 / 16, 1 / 16]]
+SHARPEN = [[0, -1, 0], [-1, 5, -1], [0, -1, 0]]
+EDGES = [[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]]
+EMBOSS = [[-2, -1, 0], [-1, 1, 1], [0, 1, 2]]
+
+# Color maps
+GRAY = ["#000000", "#ffffff"]
+HEAT = ["#000000", "#ff0000", "#ffff00", "#ffffff"]
+OCEAN = ["#000033", "#0066cc", "#66ffff"]
+
+### Operations
+# Each takes a height x width x 3 array of uint8 RGB values and returns a new one
+
+def grayscale(pixels):
+	'''Converts the pixels to gray levels (ITU-R 601 luma)'''
+	return numpy.repeat(_luma(pixels)[:, :, numpy.newaxis], 3, axis = 2)
+
+def threshold(pixels, level = 128):
+	'''Turns pixels white where their gray level is at least level, and black elsewhere'''
+	return numpy.repeat(numpy.where(_luma(pixels) >= level, 255, 0).astype(numpy.uint8)[:, :, numpy.newaxis], 3, axis = 2)
+
+def convolve(pixels, kernel):
+	'''Convolves each channel with the kernel (a square, odd-sized list of lists or array of weights).
+	The edge pixels are repeated past the border'''
+	kernel = numpy.asarray(kernel, dtype = float)
+	if kernel.ndim != 2 or kernel.shape[0] != kernel.shape[1] or not kernel.shape[0] % 2:
+		raise GraphicsError(BAD_OPTION)
+	radius = kernel.shape[0] // 2
+	height, width = pixels.shape[:2]
+	padded = numpy.pad(pixels.astype(float), ((radius, radius), (radius, radius), (0, 0)), mode = 'edge')
+	result = numpy.zeros(pixels.shape, dtype = float)
+	# one whole-image multiply-add per kernel weight
+	for dy in range(kernel.shape[0]):
+		for dx in range(kernel.shape[1]):
+			if kernel[dy, dx]:
+				result += kernel[dy, dx] * padded[dy:dy + height, dx:dx + width]
+	return numpy.clip(result + 0.5, 0, 255).astype(numpy.uint8)
+
+def resize(pixels, width, height):
+	'''Scales the pixels to width x height (nearest neighbor)'''
+	rows = (numpy.arange(height) * pixels.shape[0] // height).clip(0, pixels.shape[0] - 1)
+	columns = (numpy.arange(width) * pixels.shape[1] // width).clip(0, pixels.shape[1] - 1)
+	return pixels[rows[:, numpy.newaxis], columns]
+
+def colorMap(pixels, colors):
+	'''Maps the gray level of each pixel onto a gradient running through colors
+	(#rrggbb strings or (r, g, b) tuples, from black to white)'''
+	return _gradient(colors)[_luma(pixels)]
+
+def _luma(pixels):
+	'''Internal: the gray level of each pixel, as a height x width array of uint8'''
+	weights = numpy.array([299, 587, 114], dtype = numpy.uint32)
+	return ((pixels.astype(numpy.uint32) * weights).sum(axis = 2) // 1000).astype(numpy.uint8)
+
+def _gradient(colors):
+	'''Internal: a 256 x 3 lookup table interpolating between colors'''
+	if len(colors) < 2:
+		raise GraphicsError(BAD_OPTION)
+	stops = numpy.array([_rgb(color) for color in colors], dtype = float)
+	levels = numpy.linspace(0, 255, len(stops))
+	table = [numpy.interp(numpy.arange(256), levels, stops[:, channel]) for channel in range(3)]
+	return (numpy.column_stack(table) + 0.5).astype(numpy.uint8)
+
+def _rgb(color):
+	'''Internal: returns a color as an (r, g, b) tuple'''
+	if isinstance(color, (tuple, list)):
+		return tuple(color[:3])
+	if color.startswith("#") and len(color) == 7:
+		return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+	if HAS_PIL:
+		return ImageColor.getrgb(color)[:3]
+	raise GraphicsError(BAD_OPTION)
+
+### Pipelines
+
+class Pipeline(object):
+	'''A sequence of image operations. apply reads an Image's pixels once, runs every operation on
+	the whole array and writes the result back with a single update.
+	With workers > 1, runs of operations that work on neighborhoods of pixels (all but resize) are
+	split into horizontal strips and run in a pool of processes, which pays off for large images'''
+	def __init__(self):
+		self.operations = []
+
+	def __len__(self):
+		return len(self.operations)
+
+	def add(self, function, *args):
+		'''Adds an operation: function(pixels, *args) must return the new pixels.
+		Returns the pipeline, so that calls can be chained'''
+		self.operations.append((function, args))
+		return self
+
+	def grayscale(self):
+		return self.add(grayscale)
+
+	def threshold(self, level = 128):
+		return self.add(threshold, level)
+
+	def convolve(self, kernel):
+		return self.add(convolve, numpy.asarray(kernel, dtype = float) if HAS_NUMPY else kernel)
+
+	def resize(self, width, height):
+		return self.add(resize, width, height)
+
+	def colorMap(self, colors):
+		return self.add(colorMap, colors)
+
+	def run(self, pixels, workers = None):
+		'''Runs the pipeline over a height x width x 3 array of uint8 RGB values; returns the result'''
+		if not HAS_NUMPY:
+			raise GraphicsError("image pipelines require NumPy")
+		pixels = numpy.asarray(pixels, dtype = numpy.uint8)
+		if not workers or workers < 2:
+			return _runOperations(pixels, self.operations)
+		pool = multiprocessing.Pool(workers)
+		try:
+			for stage, halo in _stages(self.operations):
+				if halo is None:
+					pixels = _runOperations(pixels, stage)
+				else:
+					pixels = _runStrips(pool, pixels, stage, halo, workers)
+		finally:
+			pool.close()
+			pool.join()
+		return pixels
+
+	def apply(self, image, workers = None):
+		'''Runs the pipeline over the pixels of image (a graphics.Image) and writes them back.
+		Returns image or, if the pipeline resized it, a new Image with the same anchor'''
+		pixels = self.run(image.getRegion(), workers)
+		if pixels.shape[:2] != (image.getHeight(), image.getWidth()):
+			image = Image(image.getAnchor(), pixels.shape[1], pixels.shape[0])
+		image.setRegion(0, 0, pixels)
+		return image
+
+def _runOperations(pixels, operations):
+	'''Internal: applies the operations to pixels in turn'''
+	for function, args in operations:
+		pixels = function(pixels, *args)
+	return pixels
+
+def _halo(function, args):
+	'''Internal: how many rows of neighbors an operation reads on each side, or None if it
+	cannot run on strips of the image'''
+	if function is convolve:
+		return numpy.asarray(args[0]).shape[0] // 2
+	if function in (grayscale, threshold, colorMap):
+		return 0
+	return None
+
+def _stages(operations):
+	'''Internal: splits the operations into runs that can all run on strips (with the total halo
+	they need) and single operations that need the whole image (with a halo of None)'''
+	stages, current, total = [], [], 0
+	for function, args in operations:
+		halo = _halo(function, args)
+		if halo is None:
+			if current:
+				stages.append((current, total))
+			stages.append(([(function, args)], None))
+			current, total = [], 0
+		else:
+			current.append((function, args))
+			total += halo
+	if current:
+		stages.append((current, total))
+	return stages
+
+def _runStrip(job):
+	'''Internal: runs operations on one strip (in a worker process); the halo rows are cut off again'''
+	strip, operations, top, bottom = job
+	result = _runOperations(strip, operations)
+	return result[top:result.shape[0] - bottom]
+
+def _runStrips(pool, pixels, operations, halo, count):
+	'''Internal: runs operations over count strips of pixels in the pool, with halo extra rows
+	on each side of every strip so that convolutions see their neighbors'''
+	height = pixels.shape[0]
+	bounds = [height * i // count for i in range(count + 1)]
+	jobs = []
+	for start, stop in zip(bounds, bounds[1:]):
+		if stop > start:
+			top, bottom = min(halo, start), min(halo, height - stop)
+			jobs.append((pixels[start - top:stop + bottom], operations, top, bottom))
+	return numpy.concatenate(pool.map(_runStrip, jobs), axis = 0)